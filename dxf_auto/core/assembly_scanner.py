@@ -59,6 +59,11 @@ class AssemblyScanner:
         self._api = api
         self._progress_callback: Optional[Callable[[ScanProgress], None]] = None
         self._scanned_files: set = set()  # Track scanned files to avoid duplicates
+        # Component files found not to be sheet metal during the current scan,
+        # and files of assemblies: local parts stored inside an assembly
+        # report its file, so those files never identify a single body
+        self._non_sheet_metal_files: set = set()
+        self._assembly_files: set = set()
     
     def set_progress_callback(self, callback: Callable[[ScanProgress], None]):
         """Set callback for progress updates."""
@@ -111,6 +116,8 @@ class AssemblyScanner:
         
         # Clear scanned files set
         self._scanned_files.clear()
+        self._non_sheet_metal_files.clear()
+        self._assembly_files.clear()
         
         # Create progress tracker
         progress = ScanProgress(message="Подсчет компонентов...")
@@ -199,7 +206,18 @@ class AssemblyScanner:
         
         # Check for sheet metal regardless of is_detail to debug the issue
         # In theory, only details should have sheet metal bodies, but let's check all parts
-        container = part.get_sheet_metal_container()
+        # Instances of a component share its file; probe each file once.
+        # Assemblies are visited before their children, so the file of a
+        # local part's assembly is known when the local part is reached.
+        if not is_detail and file_path:
+            self._assembly_files.add(file_path)
+        cacheable = bool(file_path) and file_path not in self._assembly_files
+        if cacheable and file_path in self._non_sheet_metal_files:
+            container = None
+        else:
+            container = part.get_sheet_metal_container()
+            if container is None and cacheable:
+                self._non_sheet_metal_files.add(file_path)
         logger.debug(f"  Sheet metal container: {container is not None}")
         if container:
             has_sm = container.has_sheet_metal
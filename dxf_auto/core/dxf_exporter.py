@@ -6,11 +6,22 @@ Includes unfold generation, layer management, and file export.
 """
 
 from typing import List, Optional, Callable, Any, Dict
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    CancelledError,
+    as_completed,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from datetime import datetime
+import atexit
 import logging
+import multiprocessing.util
 import os
+import queue
 import threading
 import time
 import tempfile
@@ -18,38 +29,128 @@ import shutil
 
 from .kompas_api import (
     KompasAPI,
+    KompasConnection,
     KompasDocument,
     DocumentType,
     Part3D,
+    View2D,
 )
 from models.sheet_part import SheetPartInfo, SheetPart
 from models.export_settings import ExportSettings, LineTypeSettings
 
+# Keyboard simulation for auto-completing interactive commands
+try:
+    import win32api
+    import win32con
+    HAS_WIN32API = True
+except ImportError:
+    HAS_WIN32API = False
+
 logger = logging.getLogger(__name__)
 
+# Sentinel telling the progress dispatcher thread to exit
+_PROGRESS_STOP = object()
+
+# Marks a per-batch cached value that has not been looked up yet
+_NOT_CACHED = object()
+
+# Consecutive failures after which the preferred 3D export method is
+# forgotten and the full method cascade is probed again
+_PREFERRED_METHOD_MAX_FAILURES = 3
+
+# Consecutive failures of the posted (asynchronous) command 40373 after
+# which the fragment method issues it synchronously right away
+_POSTED_COMMAND_MAX_FAILURES = 3
+
+# Part documents kept open between parts of a batch (see _open_part_document)
+_MAX_CACHED_DOCS = 8
+
+# Fixed part of the export report, filled in by format_export_report()
+_REPORT_HEADER = (
+    "============================================================\n"
+    "ОТЧЕТ ОБ ЭКСПОРТЕ DXF\n"
+    "============================================================\n"
+    "Время начала: {start}\n"
+    "Время окончания: {end}\n"
+    "Длительность: {duration:.1f} сек\n"
+    "\n"
+    "Всего файлов: {total}\n"
+    "Успешно: {success}\n"
+    "Ошибок: {failure}\n"
+    "Успешность: {rate:.1f}%\n"
+)
+_REPORT_FAILURES_HEADER = "ОШИБКИ:\n" + "-" * 40
+_REPORT_SUCCESSES_HEADER = "УСПЕШНО ЭКСПОРТИРОВАНО:\n" + "-" * 40
+_REPORT_FOOTER = "=" * 60
+
+
+def _file_size(path: str) -> int:
+    """Get file size with a single stat call, or -1 if the file doesn't exist."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return -1
 
-@dataclass
+
+def _wait_until(
+    predicate: Callable[[], bool],
+    timeout: float,
+    initial: float = 0.01,
+    max_step: float = 0.05
+) -> bool:
+    """
+    Poll a KOMPAS state predicate with exponential backoff.
+    
+    Replaces fixed sleeps: returns as soon as the state is reached instead of
+    always paying the worst-case delay.
+    
+    Args:
+        predicate: Condition to wait for; exceptions count as False
+        timeout: Maximum wait in seconds
+        initial: First polling interval in seconds
+        max_step: Upper bound for the polling interval
+        
+    Returns:
+        True if the condition was reached, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    step = initial
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(step, remaining))
+        step = min(step * 2, max_step)
+
+
+@dataclass(slots=True)
 class ExportResult:
     """Result of a single DXF export operation."""
     
     part_info: SheetPartInfo
     success: bool = False
     output_path: str = ""
+    output_name: str = ""  # File name part of output_path, for reports
     error_message: str = ""
     warnings: List[str] = field(default_factory=list)
     
-    # Timing
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
+    # Timing: perf_counter stamps for the export duration
+    start_perf: float = 0.0
+    end_perf: float = 0.0
     
     @property
     def duration_seconds(self) -> float:
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.end_perf:
+            return self.end_perf - self.start_perf
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportProgress:
     """Progress information for export operation."""
     
@@ -66,13 +167,47 @@ class ExportProgress:
         return (self.current / self.total) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportSummary:
-    """Summary of a batch export operation."""
+    """
+    Summary of a batch export operation.
+    
+    Results are added with add_result(), which keeps them bucketed by
+    outcome so counts and filtered lists don't rescan all results.
+    If `results` was changed directly, the buckets are rebuilt on the
+    next count or lookup.
+    """
     
     results: List[ExportResult] = field(default_factory=list)
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    start_perf: float = 0.0
+    end_perf: float = 0.0
+    
+    _succeeded: List[ExportResult] = field(default_factory=list, init=False, repr=False)
+    _failed: List[ExportResult] = field(default_factory=list, init=False, repr=False)
+    
+    def add_result(self, result: ExportResult):
+        """Add a result to the summary."""
+        self.results.append(result)
+        if result.success:
+            self._succeeded.append(result)
+        else:
+            self._failed.append(result)
+    
+    def _sync_buckets(self):
+        """Rebuild the buckets if results was changed bypassing add_result()."""
+        if len(self._succeeded) + len(self._failed) != len(self.results):
+            self.finalize()
+    
+    def finalize(self):
+        """Rebuild the outcome buckets from results in a single pass."""
+        succeeded = []
+        failed = []
+        for result in self.results:
+            (succeeded if result.success else failed).append(result)
+        self._succeeded = succeeded
+        self._failed = failed
     
     @property
     def total_count(self) -> int:
@@ -80,11 +215,13 @@ class ExportSummary:
     
     @property
     def success_count(self) -> int:
-        return sum(1 for r in self.results if r.success)
+        self._sync_buckets()
+        return len(self._succeeded)
     
     @property
     def failure_count(self) -> int:
-        return sum(1 for r in self.results if not r.success)
+        self._sync_buckets()
+        return len(self._failed)
     
     @property
     def success_rate(self) -> float:
@@ -94,15 +231,17 @@ class ExportSummary:
     
     @property
     def duration_seconds(self) -> float:
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.end_perf:
+            return self.end_perf - self.start_perf
         return 0.0
     
     def get_failed_results(self) -> List[ExportResult]:
-        return [r for r in self.results if not r.success]
+        self._sync_buckets()
+        return list(self._failed)
     
     def get_successful_results(self) -> List[ExportResult]:
-        return [r for r in self.results if r.success]
+        self._sync_buckets()
+        return list(self._succeeded)
 
 
 class DXFExporter:
@@ -121,6 +260,7 @@ class DXFExporter:
     Usage:
         exporter = DXFExporter(kompas_api, settings)
         summary = exporter.export_parts(sheet_parts)
+        exporter.close()
     """
     
     # KOMPAS converter library for DXF (standard location)
@@ -137,20 +277,166 @@ class DXFExporter:
         self._api = api
         self._settings = settings
         self._progress_callback: Optional[Callable[[ExportProgress], None]] = None
-        self._cancel_requested = False
+        self._result_callback: Optional[Callable[[ExportResult], None]] = None
+        self._cancel_requested = threading.Event()
+        
+        # Progress updates closer than this interval (seconds) are coalesced
+        self._min_report_interval = 0.05
+        self._last_report = 0.0
+        
+        # Progress callbacks run on a dispatcher thread during export_parts
+        self._progress_queue: Optional[queue.Queue] = None
+        self._progress_thread: Optional[threading.Thread] = None
+        
+        # Per-batch filename state (see _begin_batch)
+        self._batch_now: Optional[datetime] = None
+        self._batch_date = ""
+        self._batch_time: Optional[str] = None
+        # Absolute output directory with a trailing separator
+        self._output_dir_prefix = ""
+        self._output_path_cache: Dict[tuple, str] = {}
+        
+        # Per-batch filesystem state: directories already created and
+        # directory listings of existing outputs (normcased names)
+        self._ensured_dirs: set = set()
+        self._existing_outputs: Dict[str, set] = {}
+        # Source file path -> whether it exists, checked once per batch
+        self._source_exists: Dict[str, bool] = {}
+        
+        # Hidden fragment reused by the 2D fragment method (see
+        # _get_scratch_fragment), closed at the end of export_parts
+        self._scratch_fragment: Optional[KompasDocument] = None
+        
+        # Temporary model file reused by every part (see _save_temp_model),
+        # the document bound to it by SaveAs and that document's source file
+        self._temp_model_path: Optional[str] = None
+        self._temp_model_doc: Optional[KompasDocument] = None
+        self._temp_model_source: Optional[str] = None
+        
+        # Part documents kept open for later parts from the same file,
+        # least recently used first; closed at the end of export_parts
+        self._open_docs: "OrderedDict[str, KompasDocument]" = OrderedDict()
+        
+        # Document this exporter last activated (see _activate_if_needed).
+        # Reset whenever a document is opened, created or closed.
+        self._active_doc: Optional[KompasDocument] = None
+        
+        # KOMPAS lookups that don't change during a batch (see _begin_batch)
+        self._converter: Any = _NOT_CACHED
+        self._command_available: Dict[int, bool] = {}
+        
+        # 3D export methods in order of preference, and the one that last
+        # worked, tried first for later parts (see _export_to_dxf_3d)
+        self._export_3d_cascade = (
+            # IConverter first (more reliable)
+            (self._export_via_converter, "IConverter"),
+            # Drawing with Associative View
+            (self._export_via_drawing_view, "Drawing with AssociativeView"),
+            # Fallback to 2D fragment with command 40373
+            (self._export_via_2d_fragment, "2D fragment method"),
+        )
+        # The cascade without methods this KOMPAS instance can't run,
+        # probed once per batch (see _probe_3d_methods)
+        self._available_3d_methods: Optional[tuple] = None
+        self._preferred_3d_method: Optional[Callable[[KompasDocument, str], bool]] = None
+        self._preferred_3d_failures = 0
+        
+        # Consecutive parts for which the posted command 40373 failed
+        # (see _export_via_2d_fragment)
+        self._posted_command_failures = 0
+        
+        # Runs the auto-complete helper of the fragment method; its single
+        # thread is started on first use and reused for every part
+        self._auto_complete_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="dxf-auto-complete"
+        )
+    
+    def close(self):
+        """Release the exporter's helper thread. The exporter can't be used afterwards."""
+        self._auto_complete_executor.shutdown(wait=False, cancel_futures=True)
     
     def set_progress_callback(self, callback: Callable[[ExportProgress], None]):
         """Set callback for progress updates."""
         self._progress_callback = callback
     
+    def set_result_callback(self, callback: Callable[[ExportResult], None]):
+        """
+        Set callback called with each part's result as soon as it is known.
+        
+        Runs on the thread that called export_parts; with parallel export
+        results arrive in completion order.
+        """
+        self._result_callback = callback
+    
     def request_cancel(self):
         """Request cancellation of export operation."""
-        self._cancel_requested = True
+        self._cancel_requested.set()
     
     def _report_progress(self, progress: ExportProgress):
-        """Report progress to callback if set."""
-        if self._progress_callback:
-            self._progress_callback(progress)
+        """
+        Report progress to callback if set.
+        
+        Updates arriving faster than the minimum interval are dropped, except
+        the final one (current == total). The callback receives a snapshot
+        copy, not the object the export loop keeps mutating.
+        """
+        callback = self._progress_callback
+        if callback is None:
+            return
+        
+        now = time.monotonic()
+        if (now - self._last_report < self._min_report_interval
+                and progress.current != progress.total):
+            return
+        self._last_report = now
+        
+        snapshot = replace(progress)
+        progress_queue = self._progress_queue
+        if progress_queue is None:
+            callback(snapshot)
+            return
+        
+        # One-slot mailbox: replace a pending update instead of queueing behind it
+        try:
+            progress_queue.get_nowait()
+        except queue.Empty:
+            pass
+        progress_queue.put_nowait(snapshot)
+    
+    def _start_progress_dispatcher(self):
+        """Start the thread that delivers progress updates to the callback."""
+        callback = self._progress_callback
+        if callback is None:
+            return
+        
+        progress_queue: queue.Queue = queue.Queue(maxsize=1)
+        
+        def dispatch():
+            while True:
+                snapshot = progress_queue.get()
+                if snapshot is _PROGRESS_STOP:
+                    return
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.error(f"Progress callback error: {e}")
+        
+        self._progress_queue = progress_queue
+        self._progress_thread = threading.Thread(
+            target=dispatch, name="dxf-export-progress", daemon=True
+        )
+        self._progress_thread.start()
+    
+    def _stop_progress_dispatcher(self):
+        """Deliver the pending update and stop the dispatcher thread."""
+        if self._progress_thread is None:
+            return
+        
+        # Blocking put: waits until the last pending update has been taken
+        self._progress_queue.put(_PROGRESS_STOP)
+        self._progress_thread.join()
+        self._progress_queue = None
+        self._progress_thread = None
     
     def export_parts(self, parts: List[SheetPartInfo]) -> ExportSummary:
         """
@@ -162,89 +448,225 @@ class DXFExporter:
         Returns:
             ExportSummary with results
         """
-        self._cancel_requested = False
-        summary = ExportSummary(start_time=datetime.now())
+        self._cancel_requested.clear()
+        summary = ExportSummary(start_time=datetime.now(), start_perf=time.perf_counter())
+        self._begin_batch(summary.start_time)
         
         # Filter to only selected parts
         export_parts = [p for p in parts if p.export_selected]
         
-        progress = ExportProgress(
-            total=len(export_parts),
-            message="Начало экспорта..."
-        )
-        self._report_progress(progress)
-        
-        # Ensure output directory exists
-        self._ensure_output_directory()
-        
-        # Export each part
-        for index, part_info in enumerate(export_parts):
-            if self._cancel_requested:
-                logger.info("Export cancelled by user")
-                break
-            
-            progress.current = index + 1
-            progress.current_part = part_info.display_name
-            progress.current_status = "Экспорт..."
+        self._start_progress_dispatcher()
+        try:
+            progress = ExportProgress(
+                total=len(export_parts),
+                message="Начало экспорта..."
+            )
             self._report_progress(progress)
             
-            result = self._export_single_part(part_info, index)
-            summary.results.append(result)
+            # Ensure output directory exists
+            self._ensure_output_directory()
+            
+            if not self._settings.overwrite_existing:
+                self._scan_existing_outputs(export_parts)
+            self._check_sources(export_parts)
             
-            # Update part info with result
-            part_info.export_path = result.output_path
-            part_info.export_status = "OK" if result.success else result.error_message
+            # Export each part
+            workers = self._settings.parallel_workers
+            if workers > 1 and len(export_parts) > 1:
+                self._export_parallel(export_parts, workers, summary, progress)
+            elif export_parts:
+                self._export_serial(export_parts, summary, progress)
+            
+            summary.end_time = datetime.now()
+            summary.end_perf = time.perf_counter()
+            summary.finalize()
+            
+            progress.message = f"Экспорт завершен: {summary.success_count}/{summary.total_count}"
+            progress.current = progress.total
+            self._report_progress(progress)
+        finally:
+            self._release_scratch_fragment()
+            self._close_part_documents()
+            # Make sure the final update reaches the callback before returning
+            self._stop_progress_dispatcher()
         
-        summary.end_time = datetime.now()
+        return summary
+    
+    def _export_serial(
+        self,
+        export_parts: List[SheetPartInfo],
+        summary: ExportSummary,
+        progress: ExportProgress
+    ):
+        """
+        Export parts one by one in this thread.
         
-        progress.message = f"Экспорт завершен: {summary.success_count}/{summary.total_count}"
-        progress.current = progress.total
-        self._report_progress(progress)
+        KOMPAS COM objects belong to this thread, so only the filesystem
+        preparation of the next part (see _prepare_output) is overlapped
+        with the export of the current one on a helper thread. With
+        prefetch_source_files enabled, the helper also reads the next
+        part's file ahead (see _prefetch_source).
+        """
+        prefetch = self._settings.prefetch_source_files
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dxf-export-prepare") as prepare_pool:
+            pending = prepare_pool.submit(self._prepare_output, export_parts[0], 0)
+            
+            for index, part_info in enumerate(export_parts):
+                if self._cancel_requested.is_set():
+                    logger.info("Export cancelled by user")
+                    pending.cancel()
+                    break
+                
+                try:
+                    output_str = pending.result()
+                except Exception:
+                    # Retried in _export_single_part, which reports the error
+                    output_str = None
+                
+                if index + 1 < len(export_parts):
+                    next_part = export_parts[index + 1]
+                    pending = prepare_pool.submit(self._prepare_output, next_part, index + 1)
+                    if prefetch:
+                        prepare_pool.submit(self._prefetch_source, next_part.file_path)
+                
+                progress.current = index + 1
+                progress.current_part = part_info.display_name
+                progress.current_status = "Экспорт..."
+                self._report_progress(progress)
+                
+                result = self._export_single_part(part_info, index, output_str)
+                self._record_result(summary, part_info, result)
+    
+    def _export_parallel(
+        self,
+        export_parts: List[SheetPartInfo],
+        workers: int,
+        summary: ExportSummary,
+        progress: ExportProgress
+    ):
+        """
+        Export parts in a pool of worker processes.
         
-        return summary
+        Each worker process drives its own KOMPAS-3D instance (see
+        _init_export_worker), so the useful worker count is bounded by the
+        number of KOMPAS instances the licence allows. It is also capped at
+        the CPU count: every instance rebuilds and converts models itself.
+        
+        Args:
+            export_parts: Parts to export
+            workers: Number of worker processes
+            summary: Summary to add results to
+            progress: Progress object to update
+        """
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(export_parts), os.cpu_count() or 1),
+            initializer=_init_export_worker,
+            initargs=(self._settings, self._batch_now)
+        ) as executor:
+            futures = {}
+            for index, part_info in enumerate(export_parts):
+                try:
+                    futures[executor.submit(_export_worker, part_info, index)] = part_info
+                except BrokenProcessPool as e:
+                    # A worker failed to start (e.g. KOMPAS could not be launched)
+                    result = ExportResult(part_info=part_info, error_message=str(e))
+                    self._record_result(summary, part_info, result)
+            cancelled = False
+            
+            for future in as_completed(futures):
+                part_info = futures[future]
+                try:
+                    result = future.result()
+                    # Worker returns a pickled copy - point back at the caller's object
+                    result.part_info = part_info
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Export worker failed on {part_info.display_name}: {e}")
+                    result = ExportResult(part_info=part_info, error_message=str(e))
+                
+                self._record_result(summary, part_info, result)
+                
+                progress.current = len(summary.results)
+                progress.current_part = part_info.display_name
+                progress.current_status = "Экспорт..."
+                self._report_progress(progress)
+                
+                if self._cancel_requested.is_set() and not cancelled:
+                    logger.info("Export cancelled by user")
+                    cancelled = True
+                    # Parts already running in workers finish; queued ones are dropped
+                    for pending in futures:
+                        pending.cancel()
+    
+    def _record_result(self, summary: ExportSummary, part_info: SheetPartInfo, result: ExportResult):
+        """Add result to summary and update part info with it."""
+        summary.add_result(result)
+        part_info.export_path = result.output_path
+        part_info.export_status = "OK" if result.success else result.error_message
+        
+        callback = self._result_callback
+        if callback is not None:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Result callback error: {e}")
     
-    def _export_single_part(self, part_info: SheetPartInfo, index: int) -> ExportResult:
+    def _export_single_part(
+        self,
+        part_info: SheetPartInfo,
+        index: int,
+        output_str: Optional[str] = None
+    ) -> ExportResult:
         """
         Export a single part to DXF.
         
         Args:
             part_info: Part information
             index: Export index (for filename)
+            output_str: Output path from _prepare_output, if already prepared
             
         Returns:
             ExportResult
         """
-        result = ExportResult(
-            part_info=part_info,
-            start_time=datetime.now()
-        )
+        result = ExportResult(part_info=part_info, start_perf=time.perf_counter())
         
         doc = None
         
         try:
-            # Generate output path
-            output_path = self._generate_output_path(part_info, index)
-            result.output_path = str(output_path)
+            if output_str is None:
+                output_str = self._prepare_output(part_info, index)
+            result.output_path = output_str
+            result.output_name = os.path.basename(output_str)
             
             # Check if file exists
-            if output_path.exists() and not self._settings.overwrite_existing:
+            if not self._settings.overwrite_existing and self._output_exists(output_str):
                 result.error_message = "Файл уже существует"
-                result.end_time = datetime.now()
+                result.end_perf = time.perf_counter()
                 return result
             
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
             # Open part document (visible for proper export)
             doc = self._open_part_document(part_info)
             if doc is None:
                 result.error_message = "Не удалось открыть документ детали"
-                result.end_time = datetime.now()
+                result.end_perf = time.perf_counter()
                 return result
             
             try:
                 # Activate the document
-                doc.activate()
+                self._active_doc = None
+                self._activate_if_needed(doc)
+                
+                # 2D documents have nothing to unfold - save them directly
+                if doc.is_2d:
+                    if self._export_to_dxf(doc, output_str, is_2d=True):
+                        result.success = True
+                        self._mark_output_written(output_str)
+                        logger.info("Successfully exported: %s", output_str)
+                    else:
+                        result.error_message = "Ошибка конвертации в DXF"
+                    result.end_perf = time.perf_counter()
+                    return result
                 
                 # Get 3D document
                 doc_3d = doc.get_3d_document()
@@ -272,24 +694,30 @@ class DXFExporter:
                 
                 body = bodies[0]
                 original_straightened = body.is_straightened
+                # Tracked locally so the state is only re-read from KOMPAS
+                # when we can't tell what it is
+                straightened = original_straightened
                 
-                logger.debug(f"Sheet metal body found, original straightened state: {original_straightened}")
+                logger.debug("Sheet metal body found, original straightened state: %s", original_straightened)
                 
                 try:
                     # CRITICAL: Activate the 3D document before any modification
-                    doc.activate()
+                    self._activate_if_needed(doc)
                     
                     # Unfold (straighten) the body if needed
                     if self._settings.straighten_before_export and not original_straightened:
                         logger.info("Straightening sheet metal body...")
                         
                         # Use the new straighten() method with verification
-                        if not body.straighten():
+                        if body.straighten():
+                            straightened = True
+                        else:
                             logger.warning("straighten() method returned False, trying direct property set")
                             body.is_straightened = True
+                            straightened = body.is_straightened
                         
                         # Verify the change actually happened
-                        if not body.is_straightened:
+                        if not straightened:
                             logger.error("Sheet metal body failed to straighten - state is still False")
                             result.error_message = "Не удалось развернуть листовое тело"
                             return result
@@ -297,26 +725,27 @@ class DXFExporter:
                         logger.info("Sheet metal body straightened successfully")
                         
                         # Rebuild to apply changes - activate first
-                        doc.activate()
+                        self._activate_if_needed(doc)
                         rebuild_result = doc.rebuild()
                         if not rebuild_result:
                             logger.warning("Rebuild returned False, but continuing with export")
                         else:
                             logger.debug("Rebuild completed successfully")
                     
-                    # Export to DXF
-                    success = self._export_to_dxf(doc, output_path)
+                    # Export to DXF (a document with a top part is never 2D)
+                    success = self._export_to_dxf(doc, output_str, is_2d=False)
                     
                     if success:
                         result.success = True
-                        logger.info(f"Successfully exported: {output_path}")
+                        self._mark_output_written(output_str)
+                        logger.info("Successfully exported: %s", output_str)
                     else:
                         result.error_message = "Ошибка конвертации в DXF"
                     
                 finally:
                     # Restore original state if we changed it
-                    if body.is_straightened != original_straightened:
-                        logger.debug(f"Restoring original straightened state: {original_straightened}")
+                    if straightened != original_straightened:
+                        logger.debug("Restoring original straightened state: %s", original_straightened)
                         if original_straightened:
                             body.straighten()
                         else:
@@ -331,20 +760,60 @@ class DXFExporter:
             result.error_message = str(e)
             
         finally:
-            # Close document after export
-            if doc is not None:
-                try:
-                    doc.close(save=False)
-                except Exception as e:
-                    logger.debug(f"Failed to close document: {e}")
+            # The document stays open for later parts from the same file
+            # (see _open_part_document) unless it was saved as the
+            # temporary model; that one is closed here
+            self._release_temp_model_doc()
         
-        result.end_time = datetime.now()
+        result.end_perf = time.perf_counter()
         return result
     
+    def _prepare_output(self, part_info: SheetPartInfo, index: int) -> str:
+        """
+        Generate the output path for a part and create its directory.
+        
+        Does not touch KOMPAS, so it is safe to run on a helper thread.
+        
+        Args:
+            part_info: Part information
+            index: Export index (for filename)
+            
+        Returns:
+            Absolute output path string, passed down to KOMPAS as is
+        """
+        output_str = self._generate_output_path(part_info, index)
+        self._ensure_directory(os.path.dirname(output_str))
+        return output_str
+    
+    def _prefetch_source(self, path: str):
+        """
+        Read a source file ahead so KOMPAS opens it from the OS file cache.
+        
+        Opening the document itself ahead is not possible: KOMPAS COM
+        objects are bound to the exporting thread and opening a visible
+        document would change the active document mid-export.
+        
+        Args:
+            path: Source file path
+        """
+        if not self._source_exists.get(path):
+            return
+        try:
+            with open(path, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+        except OSError as e:
+            logger.debug("Failed to prefetch %s: %s", path, e)
+    
     def _open_part_document(self, part_info: SheetPartInfo) -> Optional[KompasDocument]:
         """
         Open the part document.
         
+        Several parts of a batch can come from the same file, so opened
+        documents are kept until the end of the batch and reused instead of
+        being parsed again. At most _MAX_CACHED_DOCS stay open; the least
+        recently used one is closed to make room.
+        
         Args:
             part_info: Part information with file path
             
@@ -354,19 +823,60 @@ class DXFExporter:
         if not part_info.file_path:
             return None
         
-        # Check if file exists
-        if not Path(part_info.file_path).exists():
+        doc = self._open_docs.get(part_info.file_path)
+        if doc is not None:
+            self._open_docs.move_to_end(part_info.file_path)
+            return doc
+        
+        # Check if file exists (prechecked for the batch by _check_sources)
+        exists = self._source_exists.get(part_info.file_path)
+        if exists is None:
+            exists = os.path.isfile(part_info.file_path)
+        if not exists:
             logger.error(f"Part file not found: {part_info.file_path}")
             return None
         
+        if len(self._open_docs) >= _MAX_CACHED_DOCS:
+            _, oldest = self._open_docs.popitem(last=False)
+            self._close_part_document(oldest)
+        
         # Try to open document - VISIBLE for proper export
-        return self._api.documents.open(
+        doc = self._api.documents.open(
             path=part_info.file_path,
             visible=True,  # Must be visible for proper flat pattern export
             read_only=False  # Need write access to modify straighten state
         )
+        if doc is not None:
+            self._open_docs[part_info.file_path] = doc
+        return doc
+    
+    def _close_part_document(self, doc: KompasDocument):
+        """Close a part document without saving (straighten state is restored)."""
+        if self._active_doc is doc:
+            self._active_doc = None
+        try:
+            doc.close(save=False)
+        except Exception as e:
+            logger.debug("Failed to close document: %s", e)
+    
+    def _forget_part_document(self, doc: KompasDocument):
+        """Drop a document from the open documents cache without closing it."""
+        for key, cached in list(self._open_docs.items()):
+            if cached is doc:
+                del self._open_docs[key]
     
-    def _export_to_dxf(self, doc: KompasDocument, output_path: Path) -> bool:
+    def _close_part_documents(self):
+        """Close all part documents kept open by _open_part_document."""
+        while self._open_docs:
+            _, doc = self._open_docs.popitem(last=False)
+            self._close_part_document(doc)
+    
+    def _export_to_dxf(
+        self,
+        doc: KompasDocument,
+        output_path: str,
+        is_2d: Optional[bool] = None
+    ) -> bool:
         """
         Export document to DXF format.
         
@@ -376,42 +886,90 @@ class DXFExporter:
         Args:
             doc: Document to export (should be 3D with straightened sheet metal)
             output_path: Output file path
+            is_2d: Document kind if already known by the caller; queried
+                from KOMPAS when None
             
         Returns:
             True if successful
         """
         try:
-            # Method 1: For 2D documents, use SaveAs directly
-            if doc.is_2d:
-                logger.debug("Document is 2D, saving directly as DXF")
-                return doc.save_as(str(output_path))
-            
-            # Method 2: For 3D documents, try IConverter first (more reliable)
-            logger.debug("Document is 3D, trying IConverter approach")
-            if self._export_via_converter(doc, output_path):
-                return True
+            if is_2d is None:
+                is_2d = doc.is_2d
             
-            # Method 3: Try Drawing with Associative View
-            logger.debug("IConverter failed, trying Drawing with AssociativeView")
-            if self._export_via_drawing_view(doc, output_path):
-                return True
-            
-            # Method 4: Fallback to 2D fragment with command 40373
-            logger.debug("AssociativeView failed, falling back to 2D fragment method")
-            return self._export_via_2d_fragment(doc, output_path)
+            if is_2d:
+                return self._export_to_dxf_2d(doc, output_path)
+            return self._export_to_dxf_3d(doc, output_path)
             
         except Exception as e:
             logger.error(f"DXF export error: {e}")
             return False
     
-    def _export_via_converter(self, doc: KompasDocument, output_path: Path) -> bool:
+    def _export_to_dxf_2d(self, doc: KompasDocument, output_path: str) -> bool:
+        """Export a 2D document: SaveAs writes DXF directly."""
+        logger.debug("Document is 2D, saving directly as DXF")
+        return doc.save_as(output_path)
+    
+    def _export_to_dxf_3d(self, doc: KompasDocument, output_path: str) -> bool:
+        """
+        Export a 3D document with straightened sheet metal.
+        
+        Starts with the method that worked for earlier parts on this KOMPAS
+        instance, then falls back through the cascade in _export_3d_cascade.
+        """
+        preferred = self._preferred_3d_method
+        if preferred is not None:
+            if preferred(doc, output_path):
+                self._preferred_3d_failures = 0
+                return True
+            self._preferred_3d_failures += 1
+            if self._preferred_3d_failures >= _PREFERRED_METHOD_MAX_FAILURES:
+                logger.debug("%s failed %d times in a row, probing all methods again",
+                             preferred.__name__, self._preferred_3d_failures)
+                self._preferred_3d_method = None
+        
+        methods = self._available_3d_methods
+        if methods is None:
+            methods = self._probe_3d_methods()
+        for method, description in methods:
+            if method == preferred:
+                continue
+            logger.debug("Document is 3D, trying %s", description)
+            if method(doc, output_path):
+                if self._preferred_3d_method is None:
+                    self._preferred_3d_method = method
+                    self._preferred_3d_failures = 0
+                return True
+        return False
+    
+    def _probe_3d_methods(self) -> tuple:
+        """
+        Drop the 3D export methods this KOMPAS instance can't run.
+        
+        Only capabilities that can be checked without creating documents
+        are probed: without an IConverter interface the converter method
+        can never succeed. The drawing view and fragment methods have no
+        such check and stay in the cascade.
+        
+        Returns:
+            Available (method, description) pairs in order of preference
+        """
+        methods = self._export_3d_cascade
+        if self._get_converter() is None:
+            logger.info("IConverter not available, skipping it for this batch")
+            methods = tuple(
+                (method, description) for method, description in methods
+                if method != self._export_via_converter
+            )
+        self._available_3d_methods = methods
+        return methods
+    
+    def _export_via_converter(self, doc: KompasDocument, output_path: str) -> bool:
         """
         Export 3D flat pattern to DXF using IConverter interface.
         
         This method:
-        1. Saves the straightened 3D model to a temporary file
+        1. Saves the straightened 3D model to the temporary model file
         2. Uses IConverter to convert the temp file to DXF
-        3. Cleans up the temporary file
         
         This is more reliable than the interactive command approach because
         IConverter works non-interactively and doesn't require user input.
@@ -423,57 +981,48 @@ class DXFExporter:
         Returns:
             True if successful
         """
-        temp_file = None
         try:
-            source_path = doc.path_name
-            logger.debug(f"Exporting via IConverter from: {source_path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exporting via IConverter from: %s", doc.path_name)
             
             # Step 1: Get the converter interface
-            converter = self._api.get_converter()
+            converter = self._get_converter()
             if converter is None:
                 logger.warning("IConverter not available")
                 return False
             
             logger.debug("Got IConverter interface")
             
-            # Step 2: Create a temporary file path for the straightened model
-            # We need to save the current state (with flat pattern visible)
-            temp_dir = tempfile.gettempdir()
-            temp_name = f"dxf_export_temp_{os.getpid()}_{int(time.time())}.m3d"
-            temp_file = Path(temp_dir) / temp_name
-            
-            logger.debug(f"Saving temporary model to: {temp_file}")
-            
-            # Step 3: Save the document with flat pattern to temp file
+            # Step 2: Save the document with flat pattern to temp file
             # This preserves the straightened state in the temp file
-            if not doc.save_as(str(temp_file)):
+            temp_file = self._save_temp_model(doc)
+            if temp_file is None:
                 logger.warning("Failed to save temporary model file")
                 return False
             
             logger.debug("Saved temporary model with flat pattern")
             
-            # Step 4: Use IConverter to convert temp .m3d to .dxf
+            # Step 3: Use IConverter to convert temp .m3d to .dxf
             # Parameters: inputFile, outputFile, commandCode, showParams
             try:
-                logger.debug(f"Converting {temp_file} -> {output_path}")
+                logger.debug("Converting %s -> %s", temp_file, output_path)
                 result = converter.Convert(
-                    str(temp_file),    # Input file (3D model with flat pattern)
-                    str(output_path),  # Output file (DXF)
+                    temp_file,         # Input file (3D model with flat pattern)
+                    output_path,       # Output file (DXF)
                     0,                 # Command code (0 = default/auto)
                     False              # Don't show parameters dialog
                 )
-                logger.debug(f"IConverter.Convert returned: {result}")
+                logger.debug("IConverter.Convert returned: %s", result)
                 
                 if result:
                     # Verify the DXF was created
-                    if output_path.exists():
-                        file_size = output_path.stat().st_size
-                        if file_size > 500:  # Minimum size for valid DXF
-                            logger.info(f"IConverter export successful: {output_path} ({file_size} bytes)")
-                            return True
-                        else:
-                            logger.warning(f"IConverter created small file ({file_size} bytes)")
-                            return False
+                    file_size = _file_size(output_path)
+                    if file_size > 500:  # Minimum size for valid DXF
+                        logger.info("IConverter export successful: %s (%d bytes)", output_path, file_size)
+                        return True
+                    elif file_size >= 0:
+                        logger.warning("IConverter created small file (%d bytes)", file_size)
+                        return False
                     else:
                         logger.warning("IConverter returned True but file doesn't exist")
                         return False
@@ -488,28 +1037,16 @@ class DXFExporter:
         except Exception as e:
             logger.error(f"IConverter export error: {e}")
             return False
-            
-        finally:
-            # Step 5: Clean up temporary file
-            if temp_file and temp_file.exists():
-                try:
-                    temp_file.unlink()
-                    logger.debug("Cleaned up temporary model file")
-                except Exception as cleanup_error:
-                    logger.debug(f"Failed to clean up temp file: {cleanup_error}")
-        
-        return False  # Should not reach here
     
-    def _export_via_drawing_view(self, doc: KompasDocument, output_path: Path) -> bool:
+    def _export_via_drawing_view(self, doc: KompasDocument, output_path: str) -> bool:
         """
         Export 3D flat pattern to DXF using Drawing with Associative View.
         
         This method:
-        1. Saves the 3D model with flat pattern to a temp file
+        1. Saves the 3D model with flat pattern to the temporary model file
         2. Creates a new Drawing document (ksDocumentDrawing, type=1)
         3. Adds an associative view from the temp 3D file
         4. Saves the drawing as DXF
-        5. Cleans up temporary files
         
         This approach uses IViewsCollection.AddAssociationView() which
         is only available on Drawing documents (not fragments).
@@ -521,25 +1058,22 @@ class DXFExporter:
         Returns:
             True if successful
         """
-        temp_file = None
         drawing = None
         
         try:
-            source_path = doc.path_name
-            logger.debug(f"Exporting via Drawing AssociativeView from: {source_path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exporting via Drawing AssociativeView from: %s", doc.path_name)
             
             # Step 1: Save the 3D model with flat pattern to temp file
-            temp_dir = tempfile.gettempdir()
-            temp_name = f"dxf_export_temp_{os.getpid()}_{int(time.time())}.m3d"
-            temp_file = Path(temp_dir) / temp_name
-            
-            logger.debug(f"Saving temporary model to: {temp_file}")
-            if not doc.save_as(str(temp_file)):
+            # (already there if the IConverter method saved it)
+            temp_file = self._save_temp_model(doc)
+            if temp_file is None:
                 logger.warning("Failed to save temporary model file")
                 return False
             
             # Step 2: Create a new Drawing document (type=1)
             drawing = self._api.documents.add(DocumentType.DRAWING, visible=False)
+            self._active_doc = None
             if drawing is None:
                 logger.warning("Failed to create Drawing document")
                 return False
@@ -571,7 +1105,7 @@ class DXFExporter:
                     return False
                 
                 # Configure the view
-                assoc_view.SourceFileName = str(temp_file)
+                assoc_view.SourceFileName = temp_file
                 assoc_view.ProjectionName = "Top"  # Top view for flat pattern
                 assoc_view.X = 0.0
                 assoc_view.Y = 0.0
@@ -587,19 +1121,25 @@ class DXFExporter:
                 logger.warning(f"Failed to create associative view: {view_err}")
                 return False
             
-            # Step 4: Save drawing as DXF
-            time.sleep(0.3)  # Give KOMPAS time to render the view
+            # Step 4: Save drawing as DXF once KOMPAS has rendered the view
+            # (Update() is usually synchronous, so this rarely waits)
+            view = View2D(assoc_view)
+            _wait_until(lambda: view.object_count != 0, 0.5)
+            
+            # Fail fast on an empty view instead of serializing an empty DXF
+            if view.object_count == 0:
+                logger.error("Associative view produced no geometry")
+                return False
             
-            if drawing.save_as(str(output_path)):
+            if drawing.save_as(output_path):
                 # Verify the DXF was created
-                if output_path.exists():
-                    file_size = output_path.stat().st_size
-                    if file_size > 500:
-                        logger.info(f"Drawing export successful: {output_path} ({file_size} bytes)")
-                        return True
-                    else:
-                        logger.warning(f"Drawing created small DXF ({file_size} bytes)")
-                        return False
+                file_size = _file_size(output_path)
+                if file_size > 500:
+                    logger.info("Drawing export successful: %s (%d bytes)", output_path, file_size)
+                    return True
+                elif file_size >= 0:
+                    logger.warning("Drawing created small DXF (%d bytes)", file_size)
+                    return False
             
             logger.warning("Failed to save drawing as DXF")
             return False
@@ -613,17 +1153,10 @@ class DXFExporter:
             if drawing is not None:
                 try:
                     drawing.close(save=False)
-                except:
-                    pass
-            
-            if temp_file and temp_file.exists():
-                try:
-                    temp_file.unlink()
-                    logger.debug("Cleaned up temporary model file")
-                except:
-                    pass
+                except Exception as e:
+                    logger.debug("Failed to close drawing: %s", e)
     
-    def _export_via_2d_fragment(self, doc: KompasDocument, output_path: Path) -> bool:
+    def _export_via_2d_fragment(self, doc: KompasDocument, output_path: str) -> bool:
         """
         Export 3D flat pattern via 2D fragment using interactive command.
         
@@ -635,12 +1168,11 @@ class DXFExporter:
         - The 3D document must be ACTIVE when command is executed
         
         The approach:
-        1. Activate the 3D document with straightened flat pattern
-        2. Create a new 2D fragment document (visible, becomes active)
-        3. Re-activate the 3D document
-        4. Execute command 40373 (CreateSheetFromModel)
-        5. Auto-complete with StopCurrentProcess or Enter key
-        6. Activate fragment and save as DXF
+        1. Create a new hidden 2D fragment document
+        2. Activate the 3D document with straightened flat pattern
+        3. Execute command 40373 (CreateSheetFromModel)
+        4. Auto-complete with StopCurrentProcess or Enter key
+        5. Activate fragment and save as DXF
         
         Args:
             doc: 3D document with straightened flat pattern (already straightened)
@@ -649,95 +1181,106 @@ class DXFExporter:
         Returns:
             True if successful
         """
-        fragment = None
-        
         # Command constant
         CREATE_SHEET_FROM_MODEL = 40373  # ksCMCreateSheetFromModel
         
         try:
-            source_path = doc.path_name
-            logger.debug(f"Exporting flat pattern from: {source_path}")
-            
-            # Log document state for debugging
-            active_doc = self._api.active_document
-            if active_doc:
-                logger.debug(f"Currently active document: {active_doc.name}, type: {active_doc.document_type}")
-            else:
-                logger.debug("No active document")
-            
-            doc_count = self._api.documents.count
-            logger.debug(f"Total open documents: {doc_count}")
-            
-            # Step 1: Ensure 3D document is active first
-            doc.activate()
-            logger.debug(f"Activated 3D document: {doc.name}")
-            time.sleep(0.3)
+            # Log document state for debugging (each read is a COM call)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exporting flat pattern from: %s", doc.path_name)
+                
+                active_doc = self._api.active_document
+                if active_doc:
+                    logger.debug("Currently active document: %s, type: %s",
+                                 active_doc.name, active_doc.document_type)
+                else:
+                    logger.debug("No active document")
+                
+                logger.debug("Total open documents: %d", self._api.documents.count)
             
-            # Step 2: Create new 2D fragment document (INVISIBLE for command target)
+            # Step 1: Get an empty 2D fragment document (INVISIBLE for command target)
             # Try creating as invisible - according to reference docs
-            fragment = self._api.documents.add(DocumentType.FRAGMENT, visible=False)
+            fragment = self._get_scratch_fragment()
             if fragment is None:
                 logger.error("Failed to create 2D fragment document")
                 return False
-            logger.debug(f"Created 2D fragment for flat pattern view: {fragment.name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using 2D fragment for flat pattern view: %s", fragment.name)
             
-            # Step 3: CRITICAL - Keep fragment as target but 3D doc must be active
+            # Step 2: CRITICAL - Keep fragment as target but 3D doc must be active
             # Command 40373 (CreateSheetFromModel) reads geometry from active 3D doc
             # and inserts into the target 2D document
             # The 3D document with the flat pattern must be the ACTIVE document
-            time.sleep(0.2)
-            doc.activate()  # 3D document must be active - it's the SOURCE
-            time.sleep(0.3)
+            # 3D document must be active - it's the SOURCE
+            if not self._activate_if_needed(doc, timeout=1.0):
+                logger.warning("3D document did not become active")
             logger.debug("Ensured 3D document is active (source for flat pattern)")
             
             # Check if command is available before trying to execute
-            if self._api.is_command_available(CREATE_SHEET_FROM_MODEL):
+            if self._is_command_available(CREATE_SHEET_FROM_MODEL):
                 logger.debug("Command 40373 is available")
             else:
                 logger.warning("Command 40373 is NOT available - trying alternative approach")
                 # Try without threading - maybe the command works differently
                 # when not in an interactive context
             
-            # Step 4: Set up auto-completion via threading
+            # Step 3: Set up auto-completion via threading
             # The command 40373 is interactive - it waits for user to place the view
             # We use a timer to call StopCurrentProcess() which completes the command
             
             command_completed = threading.Event()
+            # Set only once KOMPAS has reported the command as running; it
+            # can't be, if this KOMPAS can't report the command state
+            command_seen = threading.Event()
+            command_state_known = self._api.is_command_active(CREATE_SHEET_FROM_MODEL) is not None
             command_success = [False]  # Use list to allow modification in nested function
             
             def auto_complete_command():
                 """Background function to auto-complete the interactive command."""
                 try:
-                    # Wait a bit for the command to start and show its dialog/cursor
-                    time.sleep(0.5)
+                    # Wait for the command to start and show its dialog/cursor;
+                    # fixed delay if KOMPAS can't report the command state
+                    if not command_state_known:
+                        time.sleep(0.5)
+                    elif _wait_until(lambda: self._api.is_command_active(CREATE_SHEET_FROM_MODEL), 0.5):
+                        command_seen.set()
                     
                     # Method 1: Call StopCurrentProcess to accept/complete the operation
                     # False = accept (confirm), True = cancel
-                    logger.debug("Auto-completing command via StopCurrentProcess(False)...")
                     result = self._api.stop_current_process(cancel=False)
-                    logger.debug(f"StopCurrentProcess result: {result}")
+                    logger.debug("Auto-completing command via StopCurrentProcess(False): %s", result)
+                    
+                    # Signal as soon as KOMPAS reports the command finished,
+                    # re-issuing the stop while it is still running
+                    if result:
+                        for _ in range(10):
+                            if self._api.is_command_active(CREATE_SHEET_FROM_MODEL) is not True:
+                                break
+                            time.sleep(0.05)
+                            self._api.stop_current_process(cancel=False)
+                        else:
+                            logger.debug("Command still active after StopCurrentProcess")
+                            result = False
                     
                     # Method 2: If StopCurrentProcess didn't work, try sending Enter key
                     if not result:
                         time.sleep(0.3)
-                        logger.debug("Trying keyboard Enter simulation...")
-                        try:
-                            # Try using win32api to send Enter key to KOMPAS window
-                            import win32api  # type: ignore
-                            import win32con  # type: ignore
-                            # VK_RETURN = 0x0D (Enter key)
-                            win32api.keybd_event(win32con.VK_RETURN, 0, 0, 0)
-                            time.sleep(0.05)
-                            win32api.keybd_event(win32con.VK_RETURN, 0, win32con.KEYEVENTF_KEYUP, 0)
-                            logger.debug("Sent Enter key via win32api")
-                        except ImportError:
+                        if HAS_WIN32API:
+                            logger.debug("Trying keyboard Enter simulation...")
+                            try:
+                                # Send Enter key (VK_RETURN) to KOMPAS window
+                                win32api.keybd_event(win32con.VK_RETURN, 0, 0, 0)
+                                time.sleep(0.05)
+                                win32api.keybd_event(win32con.VK_RETURN, 0, win32con.KEYEVENTF_KEYUP, 0)
+                                logger.debug("Sent Enter key via win32api")
+                            except Exception as ke:
+                                logger.debug("Keyboard simulation failed: %s", ke)
+                        else:
                             logger.debug("win32api not available for keyboard simulation")
-                        except Exception as ke:
-                            logger.debug(f"Keyboard simulation failed: {ke}")
-                    
-                    # Method 3: Try StopCurrentProcess again after delay
-                    time.sleep(0.2)
-                    self._api.stop_current_process(cancel=False)
+                        
+                        # Method 3: Try StopCurrentProcess again after delay
+                        time.sleep(0.2)
+                        self._api.stop_current_process(cancel=False)
                     
                     command_success[0] = True
                 except Exception as e:
@@ -746,82 +1289,232 @@ class DXFExporter:
                     command_completed.set()
             
             # Start the auto-complete timer
-            timer_thread = threading.Thread(target=auto_complete_command, daemon=True)
-            timer_thread.start()
+            self._auto_complete_executor.submit(auto_complete_command)
             
-            # Step 5: Execute the interactive command
+            # Step 4: Execute the interactive command
             # Try post=True first - this uses PostMessage which returns immediately
             # and allows the command to run asynchronously
-            logger.debug("Executing CreateSheetFromModel command (40373) with post=True...")
-            cmd_result = self._api.execute_command(CREATE_SHEET_FROM_MODEL, post=True)
-            logger.debug(f"Command execution returned: {cmd_result}")
+            # Once it has kept failing on this KOMPAS instance, skip it
+            posted = self._posted_command_failures < _POSTED_COMMAND_MAX_FAILURES
+            if posted:
+                logger.debug("Executing CreateSheetFromModel command (40373) with post=True...")
+                cmd_result = self._api.execute_command(CREATE_SHEET_FROM_MODEL, post=True)
+                logger.debug("Command execution returned: %s", cmd_result)
+                # A falsy result doesn't always mean the posted command was
+                # lost - trust it only if the helper saw the command running
+                if not cmd_result and command_state_known and command_seen.wait(0.3):
+                    logger.debug("Posted command is running despite falsy result")
+                    cmd_result = True
+                if cmd_result:
+                    self._posted_command_failures = 0
+                else:
+                    self._posted_command_failures += 1
+            else:
+                cmd_result = False
             
             # If post=True didn't work, try post=False (synchronous)
             if not cmd_result:
                 logger.debug("Retrying with post=False (synchronous mode)...")
-                time.sleep(0.2)
                 cmd_result = self._api.execute_command(CREATE_SHEET_FROM_MODEL, post=False)
-                logger.debug(f"Synchronous command returned: {cmd_result}")
+                logger.debug("Synchronous command returned: %s", cmd_result)
             
             # Wait for auto-complete to finish (with timeout)
-            command_completed.wait(timeout=5.0)
-            
-            if not command_completed.is_set():
+            if not command_completed.wait(timeout=5.0):
                 logger.warning("Auto-complete thread timed out, command may still be active")
             
-            # Give KOMPAS time to process the view creation
-            time.sleep(0.5)
+            # Wait for KOMPAS to place the view geometry in the fragment
+            fragment_2d = fragment.get_2d_document()
+            if fragment_2d is not None:
+                _wait_until(lambda: fragment_2d.object_count != 0, 2.0)
             
             # Step 5: Activate fragment and save as DXF
-            fragment.activate()
-            time.sleep(0.3)
-            
-            logger.debug(f"Saving fragment as DXF: {output_path}")
-            success = fragment.save_as(str(output_path))
-            
-            if success:
-                # Verify the file was created and has content
-                if output_path.exists():
-                    file_size = output_path.stat().st_size
-                    # DXF files with actual geometry should be at least a few KB
-                    if file_size > 500:
-                        logger.info(f"Successfully exported DXF: {output_path} ({file_size} bytes)")
-                        return True
-                    else:
-                        logger.warning(f"DXF file too small ({file_size} bytes) - view may be empty")
-                        # Try alternative: the command may not have worked
-                        return False
-                else:
-                    logger.error("DXF file was not created")
-                    return False
-            else:
+            self._activate_if_needed(fragment, timeout=1.0)
+            
+            # Fail fast on an empty fragment instead of serializing an empty DXF
+            if fragment_2d is not None and fragment_2d.object_count == 0:
+                logger.error("Associative view produced no geometry")
+                return False
+            
+            logger.debug("Saving fragment as DXF: %s", output_path)
+            if not fragment.save_as(output_path):
                 logger.error("Failed to save fragment as DXF")
                 return False
             
+            # Verify the file was created and has content
+            file_size = _file_size(output_path)
+            if file_size < 0:
+                logger.error("DXF file was not created")
+                return False
+            # DXF files with actual geometry should be at least a few KB
+            if file_size <= 500:
+                # The command may not have worked
+                logger.warning("DXF file too small (%d bytes) - view may be empty", file_size)
+                return False
+            
+            logger.info("Successfully exported DXF: %s (%d bytes)", output_path, file_size)
+            return True
+            
         except Exception as e:
             logger.exception(f"Fragment export error: {e}")
             return False
+    
+    def _get_converter(self) -> Optional[Any]:
+        """Get the IConverter interface, looked up once per batch."""
+        if self._converter is _NOT_CACHED:
+            self._converter = self._api.get_converter()
+        return self._converter
+    
+    def _is_command_available(self, command_id: int) -> bool:
+        """Check if a KOMPAS command is available, once per batch."""
+        available = self._command_available.get(command_id)
+        if available is None:
+            available = self._api.is_command_available(command_id)
+            self._command_available[command_id] = available
+        return available
+    
+    def _save_temp_model(self, doc: KompasDocument) -> Optional[str]:
+        """
+        Save the document to the temporary model file.
+        
+        One file per process is overwritten for every part instead of
+        creating and deleting a file per export; it is removed at exit.
+        
+        SaveAs binds the document to the temporary file, so it is taken out
+        of the open documents cache (a later part from its source file
+        opens the source again) and closed at the end of the part by
+        _release_temp_model_doc. No other document is bound to the file
+        when it is overwritten. A document already bound to the file is
+        not saved again: its state is what the file holds.
+        
+        Args:
+            doc: 3D document with straightened flat pattern
             
-        finally:
-            # Close fragment without saving (we already saved as DXF)
-            if fragment is not None:
-                try:
-                    fragment.close(save=False)
-                except:
-                    pass
+        Returns:
+            Temporary model path, or None if saving failed
+        """
+        if self._temp_model_path is None:
+            self._temp_model_path = os.path.join(
+                tempfile.gettempdir(), f"dxf_export_temp_{os.getpid()}.m3d"
+            )
+            atexit.register(self._remove_temp_model)
+        
+        source = doc.path_name
+        if (self._temp_model_source is not None
+                and os.path.normcase(source) == os.path.normcase(self._temp_model_path)):
+            return self._temp_model_path
+        
+        if self._temp_model_doc is not doc:
+            self._release_temp_model_doc()
+        self._forget_part_document(doc)
+        
+        logger.debug("Saving temporary model of %s to: %s", source, self._temp_model_path)
+        self._temp_model_doc = doc
+        if not doc.save_as(self._temp_model_path):
+            return None
+        self._temp_model_source = source
+        return self._temp_model_path
+    
+    def _release_temp_model_doc(self):
+        """Close the document bound to the temporary model file, if any."""
+        doc = self._temp_model_doc
+        self._temp_model_doc = None
+        self._temp_model_source = None
+        if doc is not None:
+            self._close_part_document(doc)
+    
+    def _remove_temp_model(self):
+        """Remove the temporary model file."""
+        if self._temp_model_path:
+            try:
+                os.remove(self._temp_model_path)
+                logger.debug("Cleaned up temporary model file")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug("Failed to clean up temp file: %s", e)
+    
+    def _get_scratch_fragment(self) -> Optional[KompasDocument]:
+        """
+        Get an empty hidden 2D fragment for the fragment export method.
+        
+        The fragment is kept open for the whole batch and emptied before
+        each reuse, so KOMPAS creates it once instead of once per part.
+        If it cannot be emptied, it is closed and a new one is created.
+        
+        Returns:
+            Fragment document or None if creation failed
+        """
+        fragment = self._scratch_fragment
+        if fragment is not None:
+            fragment_2d = fragment.get_2d_document()
+            if fragment_2d is not None and fragment_2d.clear_views():
+                return fragment
+            logger.debug("Scratch fragment could not be cleared, recreating it")
+            self._release_scratch_fragment()
+        
+        self._active_doc = None
+        self._scratch_fragment = self._api.documents.add(DocumentType.FRAGMENT, visible=False)
+        return self._scratch_fragment
     
-    def _generate_output_path(self, part_info: SheetPartInfo, index: int) -> Path:
+    def _activate_if_needed(self, doc: KompasDocument, timeout: float = 0.0) -> bool:
+        """
+        Activate a document unless this exporter already activated it.
+        
+        Every activation is a COM round-trip. Between opening and closing
+        a part, the active document only changes when the exporter
+        activates, opens or creates a document, and all of those reset
+        the remembered one.
+        
+        Args:
+            doc: Document to activate
+            timeout: If set, wait up to this many seconds for KOMPAS to
+                report the document active after activating it
+            
+        Returns:
+            False if the document did not become active
+        """
+        if self._active_doc is doc:
+            return True
+        if not doc.activate():
+            return False
+        if timeout and not _wait_until(lambda: doc.is_active, timeout):
+            return False
+        self._active_doc = doc
+        return True
+    
+    def _release_scratch_fragment(self):
+        """Close the scratch fragment without saving (already saved as DXF)."""
+        fragment, self._scratch_fragment = self._scratch_fragment, None
+        if fragment is not None:
+            try:
+                fragment.close(save=False)
+            except Exception as e:
+                logger.debug("Failed to close scratch fragment: %s", e)
+    
+    def _generate_output_path(self, part_info: SheetPartInfo, index: int) -> str:
         """
         Generate output file path for a part.
         
+        The output directory is resolved once per batch (see _begin_batch),
+        only the file name is formatted per part.
+        
         Args:
             part_info: Part information
             index: Export index
             
         Returns:
-            Path object for output file
+            Absolute output file path
         """
-        now = datetime.now()
+        if self._batch_time is None:
+            self._begin_batch(datetime.now())
+        
+        key = (
+            part_info.designation, part_info.name, part_info.material,
+            part_info.thickness, part_info.mass, part_info.file_name, index,
+        )
+        cached = self._output_path_cache.get(key)
+        if cached is not None:
+            return cached
         
         # Build variable dictionary for filename template
         variables = {
@@ -832,20 +1525,141 @@ class DXFExporter:
             'mass': f"{part_info.mass:.3f}" if part_info.mass else '',
             'filename': part_info.file_name or '',
             'index': str(index + 1),
-            'date': now.strftime('%Y-%m-%d'),
-            'time': now.strftime('%H-%M-%S'),
+            'date': self._batch_date,
+            'time': self._batch_time,
         }
         
-        return self._settings.get_output_path(
-            base_name=part_info.file_name or f"part_{index}",
-            variables=variables
-        )
+        filename = self._settings.filename_settings.format(variables)
+        output_path = f"{self._output_dir_prefix}{filename}"
+        self._output_path_cache[key] = output_path
+        return output_path
+    
+    def _begin_batch(self, now: datetime):
+        """
+        Start a new export batch.
+        
+        Date/time variables are sampled once per batch and output paths are
+        cached for the batch, so retries of a part get the same file name.
+        
+        Args:
+            now: Batch timestamp
+        """
+        self._batch_now = now
+        self._batch_date = now.strftime('%Y-%m-%d')
+        self._batch_time = now.strftime('%H-%M-%S')
+        output_dir = os.path.abspath(self._settings.get_output_directory(now))
+        self._output_dir_prefix = os.path.join(output_dir, '')
+        self._output_path_cache.clear()
+        self._ensured_dirs.clear()
+        self._existing_outputs.clear()
+        self._source_exists.clear()
+        self._converter = _NOT_CACHED
+        self._command_available.clear()
+        self._available_3d_methods = None
+        self._posted_command_failures = 0
+        # Let the first progress update of the batch through
+        self._last_report = 0.0
+    
+    def _scan_existing_outputs(self, export_parts: List[SheetPartInfo]):
+        """
+        List each target directory once so that overwrite checks don't need
+        a stat call per part.
+        
+        Args:
+            export_parts: Parts planned for export in this batch
+        """
+        directories = {
+            os.path.dirname(self._generate_output_path(part_info, index))
+            for index, part_info in enumerate(export_parts)
+        }
+        for directory in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    names = {os.path.normcase(entry.name) for entry in entries}
+            except FileNotFoundError:
+                names = set()
+            except OSError as e:
+                # Unknown state - _output_exists falls back to a stat call
+                logger.debug("Failed to scan output directory %s: %s", directory, e)
+                continue
+            self._existing_outputs[directory] = names
+    
+    def _check_sources(self, export_parts: List[SheetPartInfo]):
+        """
+        Check that the source files of the batch exist, once per file.
+        
+        Args:
+            export_parts: Parts planned for export in this batch
+        """
+        for part_info in export_parts:
+            path = part_info.file_path
+            if path and path not in self._source_exists:
+                self._source_exists[path] = os.path.isfile(path)
+    
+    def _output_exists(self, output_path: str) -> bool:
+        """Check if output file exists, using the batch directory listing if available."""
+        directory, name = os.path.split(output_path)
+        names = self._existing_outputs.get(directory)
+        if names is None:
+            return os.path.exists(output_path)
+        return os.path.normcase(name) in names
+    
+    def _mark_output_written(self, output_path: str):
+        """Record a written output so later parts of the batch see it."""
+        directory, name = os.path.split(output_path)
+        names = self._existing_outputs.get(directory)
+        if names is not None:
+            names.add(os.path.normcase(name))
+    
+    def _ensure_directory(self, directory: str):
+        """Create directory once per batch."""
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
     
     def _ensure_output_directory(self):
         """Ensure output directory exists."""
         if self._settings.output_directory:
-            output_dir = Path(self._settings.output_directory)
-            output_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_directory(os.path.abspath(self._settings.output_directory))
+
+
+# Exporter of the current worker process, created by _init_export_worker
+_worker_exporter: Optional[DXFExporter] = None
+
+
+def _init_export_worker(settings: ExportSettings, batch_now: datetime):
+    """
+    Initialize a parallel export worker process.
+    
+    COM objects cannot cross process boundaries, and command 40373 works on
+    the active document of its KOMPAS instance, so every worker starts its
+    own KOMPAS-3D instance. It is closed when the worker process exits.
+    
+    Args:
+        settings: Export settings
+        batch_now: Batch timestamp of the parent exporter
+    """
+    global _worker_exporter
+    
+    import pythoncom  # type: ignore
+    pythoncom.CoInitialize()
+    
+    connection = KompasConnection(visible=True, new_instance=True)
+    _worker_exporter = DXFExporter(connection.connect(), settings)
+    _worker_exporter._begin_batch(batch_now)
+    # Higher exit priorities run first: close the scratch fragment and part
+    # documents before KOMPAS
+    multiprocessing.util.Finalize(None, _worker_exporter._release_scratch_fragment, exitpriority=20)
+    multiprocessing.util.Finalize(None, _worker_exporter._close_part_documents, exitpriority=15)
+    multiprocessing.util.Finalize(None, connection.disconnect, exitpriority=10)
+    # Worker processes skip atexit handlers; remove the temp model after
+    # KOMPAS has released it
+    multiprocessing.util.Finalize(None, _worker_exporter._remove_temp_model, exitpriority=5)
+
+
+def _export_worker(part_info: SheetPartInfo, index: int) -> ExportResult:
+    """Export a single part in a worker process."""
+    return _worker_exporter._export_single_part(part_info, index)
 
 
 class DXFPostProcessor:
@@ -900,34 +1714,31 @@ def format_export_report(summary: ExportSummary) -> str:
     Returns:
         Formatted report string
     """
-    lines = [
-        "=" * 60,
-        "ОТЧЕТ ОБ ЭКСПОРТЕ DXF",
-        "=" * 60,
-        f"Время начала: {summary.start_time.strftime('%Y-%m-%d %H:%M:%S') if summary.start_time else 'N/A'}",
-        f"Время окончания: {summary.end_time.strftime('%Y-%m-%d %H:%M:%S') if summary.end_time else 'N/A'}",
-        f"Длительность: {summary.duration_seconds:.1f} сек",
-        "",
-        f"Всего файлов: {summary.total_count}",
-        f"Успешно: {summary.success_count}",
-        f"Ошибок: {summary.failure_count}",
-        f"Успешность: {summary.success_rate:.1f}%",
-        "",
-    ]
+    parts = [_REPORT_HEADER.format(
+        start=summary.start_time.strftime('%Y-%m-%d %H:%M:%S') if summary.start_time else 'N/A',
+        end=summary.end_time.strftime('%Y-%m-%d %H:%M:%S') if summary.end_time else 'N/A',
+        duration=summary.duration_seconds,
+        total=summary.total_count,
+        success=summary.success_count,
+        failure=summary.failure_count,
+        rate=summary.success_rate,
+    )]
     
     if summary.failure_count > 0:
-        lines.append("ОШИБКИ:")
-        lines.append("-" * 40)
-        for result in summary.get_failed_results():
-            lines.append(f"  {result.part_info.display_name}: {result.error_message}")
-        lines.append("")
+        parts.append(_REPORT_FAILURES_HEADER)
+        parts.extend(
+            f"  {result.part_info.display_name}: {result.error_message}"
+            for result in summary.get_failed_results()
+        )
+        parts.append("")
     
     if summary.success_count > 0:
-        lines.append("УСПЕШНО ЭКСПОРТИРОВАНО:")
-        lines.append("-" * 40)
-        for result in summary.get_successful_results():
-            lines.append(f"  {result.part_info.display_name} -> {Path(result.output_path).name}")
+        parts.append(_REPORT_SUCCESSES_HEADER)
+        parts.extend(
+            f"  {result.part_info.display_name} -> {result.output_name}"
+            for result in summary.get_successful_results()
+        )
     
-    lines.append("=" * 60)
+    parts.append(_REPORT_FOOTER)
     
-    return "\n".join(lines)
+    return "\n".join(parts)
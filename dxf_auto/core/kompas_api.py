@@ -7,10 +7,11 @@ Uses the KOMPAS API version 7 (IApplication, IDocuments, etc.)
 Reference: https://help.ascon.ru/KOMPAS_SDK/22/ru-RU/ap1782828.html
 """
 
-from typing import Optional, Any, List, Tuple
+from typing import Optional, Any, List, Tuple, Callable, Dict
 from dataclasses import dataclass
 from enum import IntEnum
 import logging
+import sys
 
 # Windows COM imports
 try:
@@ -38,12 +39,27 @@ class DocumentType(IntEnum):
     TECH_ASSEMBLY = 7 # ksDocumentTechnologyAssembly
 
 
+# Feature type of sheet metal bodies (ksObj3dTypeEnum.o3d_sheetMetalBody)
+O3D_SHEET_METAL_BODY = 74
+
+# Document type groups checked by KompasDocument.is_3d / is_2d
+_3D_DOCUMENT_TYPES = frozenset((DocumentType.PART, DocumentType.ASSEMBLY))
+_2D_DOCUMENT_TYPES = frozenset((DocumentType.DRAWING, DocumentType.FRAGMENT))
+
+
 class KompasCommand(IntEnum):
     """KOMPAS command IDs (ksKompasCommandEnum)."""
     REBUILD_3D = 40356           # ksCM3DRebuild
     CREATE_SHEET_FROM_MODEL = 40373  # ksCMCreateSheetFromModel
 
 
+# Argument types of IApplication.GetSystemVersion: four long out-parameters
+_VERSION_ARG_TYPES = (
+    ((pythoncom.VT_I4 | pythoncom.VT_BYREF, pythoncom.PARAMFLAG_FOUT),) * 4
+    if HAS_WIN32 else ()
+)
+
+
 def _ensure_dynamic_dispatch(com_object: Any) -> Any:
     """
     Ensure COM object is wrapped in dynamic (late-bound) dispatch.
@@ -53,6 +69,10 @@ def _ensure_dynamic_dispatch(com_object: Any) -> Any:
     - Late-bound objects use IDispatch and can access ALL properties, including inherited interfaces
     - IPart7 inherits from ISheetMetalContainer but early-bound IPart7 doesn't expose SheetMetalBodies
     
+    Objects that already are dynamic wrappers are returned as is: a fresh
+    wrapper would rebuild its type information and forget the DISPIDs
+    looked up so far.
+    
     Args:
         com_object: COM object (may be early-bound or late-bound)
         
@@ -62,6 +82,9 @@ def _ensure_dynamic_dispatch(com_object: Any) -> Any:
     if not HAS_WIN32 or com_object is None:
         return com_object
     
+    if isinstance(com_object, win32com.client.dynamic.CDispatch):
+        return com_object
+    
     try:
         # If object has _oleobj_, it's a wrapped COM object - get the raw IDispatch
         if hasattr(com_object, '_oleobj_'):
@@ -77,8 +100,144 @@ def _ensure_dynamic_dispatch(com_object: Any) -> Any:
         return com_object
 
 
+# Items requested per IEnumVARIANT::Next call (see _enumerate_collection)
+_ENUM_CHUNK = 32
+
+
+def _enumerate_collection(collection: Any) -> Optional[List[Any]]:
+    """
+    Fetch all items of a COM collection through its enumerator.
+    
+    IEnumVARIANT::Next returns items in chunks, one round-trip per
+    _ENUM_CHUNK items instead of one Item(i) call per item.
+    
+    Args:
+        collection: COM collection object
+        
+    Returns:
+        Dynamic dispatch wrappers of the items, or None if the collection
+        can't be enumerated (callers then fall back to Count/Item)
+    """
+    if not HAS_WIN32 or collection is None:
+        return None
+    
+    try:
+        oleobj = getattr(collection, '_oleobj_', collection)
+        enum = oleobj.InvokeTypes(
+            pythoncom.DISPID_NEWENUM, 0,
+            pythoncom.DISPATCH_METHOD | pythoncom.DISPATCH_PROPERTYGET,
+            (pythoncom.VT_UNKNOWN, 10), ()
+        ).QueryInterface(pythoncom.IID_IEnumVARIANT)
+        
+        items = []
+        while True:
+            chunk = enum.Next(_ENUM_CHUNK)
+            if not chunk:
+                break
+            items.extend(chunk)
+    except Exception as e:
+        logger.debug("Collection enumeration not available: %s", e)
+        return None
+    
+    return [_ensure_dynamic_dispatch(item) for item in items if item is not None]
+
+
+def _get_property(com_object: Any, prop: str, dispids: Dict[str, int]) -> Any:
+    """
+    Read a COM property through a DISPID table shared by one interface.
+    
+    A dynamic dispatch wrapper resolves names through type information
+    that every new wrapper loads again. All objects of an interface share
+    DISPIDs, so the name is resolved once and later reads are a single
+    Invoke.
+    
+    Args:
+        com_object: COM object to read from
+        prop: COM property name
+        dispids: DISPIDs resolved so far for the object's interface
+        
+    Returns:
+        Property value (dispatch results wrapped for dynamic access)
+    """
+    oleobj = getattr(com_object, '_oleobj_', None) if HAS_WIN32 else None
+    if oleobj is None:
+        return getattr(com_object, prop)
+    
+    dispid = dispids.get(prop)
+    if dispid is None:
+        dispid = oleobj.GetIDsOfNames(prop)
+        dispids[prop] = dispid
+    value = oleobj.Invoke(
+        dispid, 0, pythoncom.DISPATCH_METHOD | pythoncom.DISPATCH_PROPERTYGET, True
+    )
+    if isinstance(value, pythoncom.TypeIIDs[pythoncom.IID_IDispatch]):
+        value = _ensure_dynamic_dispatch(value)
+    return value
+
+
+def _read_cached(
+    cache: Dict[str, Any],
+    com_object: Any,
+    prop: str,
+    convert: Callable[[Any], Any],
+    default: Any,
+    dispids: Dict[str, int]
+) -> Any:
+    """
+    Read a COM property once and keep the converted value.
+    
+    Used for properties that don't change while a wrapper is in use, so
+    repeated reads (e.g. during a BOM walk) don't go back to KOMPAS.
+    
+    Args:
+        cache: Wrapper's value cache, keyed by COM property name
+        com_object: COM object to read from
+        prop: COM property name
+        convert: Conversion of the raw value
+        default: Value used if the property can't be read
+        dispids: DISPID table of the object's interface (see _get_property)
+        
+    Returns:
+        Converted property value
+    """
+    try:
+        return cache[prop]
+    except KeyError:
+        pass
+    try:
+        value = convert(_get_property(com_object, prop, dispids))
+    except Exception:
+        value = default
+    cache[prop] = value
+    return value
+
+
+def _to_str(value: Any) -> str:
+    """Convert a COM string property value (BSTR arrives as str already)."""
+    if isinstance(value, str):
+        return value
+    return str(value) if value else ""
+
+
+def _to_name(value: Any) -> str:
+    """Convert a name-like COM string; equal names share one interned object."""
+    return sys.intern(_to_str(value))
+
+
+def _material_name(material: Any) -> str:
+    """Get the material name; Material may be a string or an object."""
+    if not material:
+        return ""
+    if isinstance(material, str):
+        return material
+    try:
+        return str(material.Name)
+    except AttributeError:
+        return str(material)
+
+
 # Type stubs for KOMPAS interfaces
-@dataclass
+@dataclass(slots=True)
 class InterfaceWrapper:
     """Base wrapper for COM interfaces."""
     _com_object: Any
@@ -92,6 +251,20 @@ class InterfaceWrapper:
         return self._com_object
 
 
+@dataclass(slots=True)
+class PartSnapshot:
+    """Plain copy of a component's properties (see Part3D.snapshot)."""
+    name: str
+    marking: str
+    file_name: str
+    material: str
+    mass: float
+    density: float
+    is_detail: bool
+    is_standard: bool
+    instance_count: int
+
+
 class KompasConnection:
     """
     Manages connection to KOMPAS-3D application via COM.
@@ -136,7 +309,7 @@ class KompasConnection:
                 try:
                     self._app = GetActiveObject(self.PROGID)
                     logger.info("Connected to running KOMPAS-3D instance")
-                except:
+                except Exception:
                     pass
             
             if self._app is None:
@@ -164,7 +337,7 @@ class KompasConnection:
                 # Only quit if we created the instance
                 if self._owns_instance:
                     self._app.Quit()
-            except:
+            except Exception:
                 pass
             self._app = None
     
@@ -187,6 +360,9 @@ class KompasAPI:
     - Converter for DXF export
     """
     
+    # DISPIDs of IApplication methods called through InvokeTypes
+    _dispids: Dict[str, int] = {}
+    
     def __init__(self, app_object: Any):
         """
         Initialize API wrapper.
@@ -195,6 +371,8 @@ class KompasAPI:
             app_object: COM IApplication object
         """
         self._app = app_object
+        # KOMPAS version, read once (see get_system_version)
+        self._version: Optional[Tuple[int, int, int, int]] = None
     
     @property
     def application(self) -> Any:
@@ -275,39 +453,85 @@ class KompasAPI:
             # IMPORTANT: Must pass integer (0 or 1) for COM BOOL, not Python bool
             cancel_int = 1 if cancel else 0
             self._app.StopCurrentProcess(cancel_int)
-            logger.debug(f"StopCurrentProcess called with cancel={cancel_int}")
+            logger.debug("StopCurrentProcess called with cancel=%s", cancel_int)
             return True
         except Exception as e:
-            logger.debug(f"StopCurrentProcess failed: {e}")
+            logger.debug("StopCurrentProcess failed: %s", e)
             return False
     
     def is_command_available(self, command_id: int) -> bool:
         """Check if a command is currently available."""
         try:
             return bool(self._app.IsKompasCommandEnable(command_id))
-        except:
+        except Exception:
             return False
     
+    def is_command_active(self, command_id: int) -> Optional[bool]:
+        """
+        Check if a command is currently running (its button is checked).
+        
+        Returns:
+            True/False, or None if KOMPAS cannot report the command state
+        """
+        try:
+            return bool(self._app.IsKompasCommandCheck(command_id))
+        except Exception as e:
+            logger.debug("IsKompasCommandCheck failed: %s", e)
+            return None
+    
     def get_system_version(self) -> Tuple[int, int, int, int]:
         """
         Get KOMPAS-3D system version.
         
+        The version doesn't change while KOMPAS runs, so it is asked once;
+        a failed read is retried on the next call.
+        
         Returns:
             Tuple of (major, minor, build, revision)
         """
-        try:
-            major = pythoncom.Variant(0)
-            minor = pythoncom.Variant(0)  
-            build = pythoncom.Variant(0)
-            revision = pythoncom.Variant(0)
-            self._app.GetSystemVersion(major, minor, build, revision)
-            return (major.value, minor.value, build.value, revision.value)
-        except:
+        if self._version is None:
+            version = self._read_system_version()
+            if version == (0, 0, 0, 0):
+                return version
+            self._version = version
+        return self._version
+    
+    def _read_system_version(self) -> Tuple[int, int, int, int]:
+        """Ask KOMPAS for its version; (0, 0, 0, 0) if that fails."""
+        try:
+            oleobj = getattr(self._app, '_oleobj_', None)
+            if oleobj is None:
+                major = pythoncom.Variant(0)
+                minor = pythoncom.Variant(0)
+                build = pythoncom.Variant(0)
+                revision = pythoncom.Variant(0)
+                self._app.GetSystemVersion(major, minor, build, revision)
+                return (major.value, minor.value, build.value, revision.value)
+            
+            # One typed call; the out-parameters come back in the result tuple
+            dispid = self._dispids.get('GetSystemVersion')
+            if dispid is None:
+                dispid = oleobj.GetIDsOfNames('GetSystemVersion')
+                self._dispids['GetSystemVersion'] = dispid
+            result = oleobj.InvokeTypes(
+                dispid, 0, pythoncom.DISPATCH_METHOD,
+                (pythoncom.VT_EMPTY, 0), _VERSION_ARG_TYPES, 0, 0, 0, 0
+            )
+            return tuple(result[-4:])
+        except Exception:
             return (0, 0, 0, 0)
 
 
 class DocumentsCollection:
-    """Wrapper for IDocuments collection."""
+    """
+    Wrapper for IDocuments collection.
+    
+    KompasAPI.documents returns a new wrapper on every access, so nothing is
+    cached here: len() asks KOMPAS for the count, iteration and documents
+    read the open documents each time.
+    """
+    
+    __slots__ = ('_docs',)
     
     def __init__(self, docs_object: Any):
         self._docs = docs_object
@@ -321,8 +545,15 @@ class DocumentsCollection:
         return self.count
     
     def __iter__(self):
-        for i in range(self.count):
-            yield KompasDocument(self._docs.Item(i))
+        return iter(self.documents)
+    
+    @property
+    def documents(self) -> Tuple['KompasDocument', ...]:
+        """Get the open documents."""
+        items = _enumerate_collection(self._docs)
+        if items is None:
+            items = [self._docs.Item(i) for i in range(self.count)]
+        return tuple(KompasDocument(item) for item in items)
     
     def open(self, path: str, visible: bool = True, read_only: bool = False) -> Optional['KompasDocument']:
         """
@@ -358,7 +589,10 @@ class DocumentsCollection:
         try:
             doc = self._docs.Add(int(doc_type), visible)
             if doc is not None:
-                return KompasDocument(doc)
+                document = KompasDocument(doc)
+                # The type is known - no need to ask KOMPAS for it
+                document._doc_type = DocumentType(doc_type)
+                return document
         except Exception as e:
             logger.error(f"Failed to create document: {e}")
         return None
@@ -372,9 +606,14 @@ class KompasDocument:
     Can represent 2D or 3D documents.
     """
     
+    __slots__ = ('_doc', '_doc_type', '_path_name', '_name')
+    
     def __init__(self, doc_object: Any):
         self._doc = doc_object
         self._doc_type = None
+        # Read once; SaveAs changes them, see save_as
+        self._path_name: Optional[str] = None
+        self._name: Optional[str] = None
     
     @property
     def raw(self) -> Any:
@@ -384,18 +623,22 @@ class KompasDocument:
     @property
     def path_name(self) -> str:
         """Get full path of the document file."""
-        try:
-            return str(self._doc.PathName) or ""
-        except:
-            return ""
+        if self._path_name is None:
+            try:
+                self._path_name = _to_str(self._doc.PathName)
+            except Exception:
+                return ""
+        return self._path_name
     
     @property
     def name(self) -> str:
         """Get document name (without path)."""
-        try:
-            return str(self._doc.Name) or ""
-        except:
-            return ""
+        if self._name is None:
+            try:
+                self._name = _to_str(self._doc.Name)
+            except Exception:
+                return ""
+        return self._name
     
     @property 
     def document_type(self) -> DocumentType:
@@ -403,19 +646,19 @@ class KompasDocument:
         if self._doc_type is None:
             try:
                 self._doc_type = DocumentType(self._doc.DocumentType)
-            except:
+            except Exception:
                 self._doc_type = DocumentType.UNKNOWN
         return self._doc_type
     
     @property
     def is_3d(self) -> bool:
         """Check if document is a 3D model (part or assembly)."""
-        return self.document_type in (DocumentType.PART, DocumentType.ASSEMBLY)
+        return self.document_type in _3D_DOCUMENT_TYPES
     
     @property
     def is_2d(self) -> bool:
         """Check if document is a 2D drawing or fragment."""
-        return self.document_type in (DocumentType.DRAWING, DocumentType.FRAGMENT)
+        return self.document_type in _2D_DOCUMENT_TYPES
     
     @property
     def is_assembly(self) -> bool:
@@ -427,6 +670,14 @@ class KompasDocument:
         """Check if document is a part."""
         return self.document_type == DocumentType.PART
     
+    @property
+    def is_active(self) -> bool:
+        """Check if this document is the active one in KOMPAS."""
+        try:
+            return bool(self._doc.Active)
+        except Exception:
+            return False
+    
     def activate(self) -> bool:
         """
         Make this document active in KOMPAS.
@@ -462,7 +713,7 @@ class KompasDocument:
             result = app.ExecuteKompasCommand(KompasCommand.REBUILD_3D, False)
             return bool(result)
         except Exception as e:
-            logger.debug(f"Failed to rebuild document: {e}")
+            logger.debug("Failed to rebuild document: %s", e)
             return False
     
     def close(self, save: bool = False) -> bool:
@@ -503,6 +754,7 @@ class KompasDocument:
         Returns:
             True if saved successfully
         """
+        self._path_name = self._name = None
         try:
             self._doc.SaveAs(path)
             return True
@@ -543,6 +795,8 @@ class KompasDocument3D:
     properties, since the base IKompasDocument interface doesn't expose them.
     """
     
+    __slots__ = ('_doc',)
+    
     def __init__(self, doc_object: Any):
         # Use dynamic dispatch (late-binding) to access IKompasDocument3D properties
         # This is necessary because ActiveDocument returns IKompasDocument,
@@ -584,27 +838,40 @@ class Part3D:
     Note: Uses dynamic dispatch to access all IPart7 properties reliably.
     """
     
+    __slots__ = ('_part', '_sheet_metal_container', '_values', '_parts')
+    
+    # DISPIDs of IPart7 properties (see _get_property)
+    _dispids: Dict[str, int] = {}
+    
     def __init__(self, part_object: Any):
         # Use dynamic dispatch (late-binding) to access IPart7 and inherited interfaces
         # This is CRITICAL because early-bound IPart7 doesn't expose SheetMetalBodies
         # which is defined on ISheetMetalContainer (an interface IPart7 inherits from).
         # Dynamic dispatch allows access to ALL properties via IDispatch.
         self._part = _ensure_dynamic_dispatch(part_object)
+        # None until probed, False if the part has no sheet metal
         self._sheet_metal_container = None
+        # Component properties read so far (see _read_cached) and child
+        # wrappers; a component doesn't change while it is being scanned
+        self._values: Dict[str, Any] = {}
+        self._parts: Optional[List['Part3D']] = None
     
     def _debug_com_info(self) -> None:
         """Debug method to log COM object information."""
+        # Every probe below is a COM call - skip them unless they get logged
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         try:
             # Log basic type info
-            logger.debug(f"COM object type: {type(self._part)}")
+            logger.debug("COM object type: %s", type(self._part))
             
             # Try to get TypeInfo
             try:
-                import pythoncom
                 disp = self._part._oleobj_
                 type_info = disp.GetTypeInfo(0, pythoncom.LOCALE_USER_DEFAULT)
                 logger.debug(f"TypeInfo: {type_info}")
-            except:
+            except Exception:
                 pass
             
             # List some expected properties/methods
@@ -629,109 +896,117 @@ class Part3D:
     @property
     def name(self) -> str:
         """Get part name."""
-        try:
-            # Try to get name from IModelObject interface
-            return str(self._part.Name) or ""
-        except:
-            return ""
+        # Name comes from the IModelObject interface
+        return _read_cached(self._values, self._part, 'Name', _to_str, "", self._dispids)
     
     @property
     def marking(self) -> str:
         """Get part designation/marking (Обозначение)."""
-        try:
-            return str(self._part.Marking) or ""
-        except:
-            return ""
+        return _read_cached(self._values, self._part, 'Marking', _to_name, "", self._dispids)
     
     @property
     def file_name(self) -> str:
         """Get part source file name."""
-        try:
-            return str(self._part.FileName) or ""
-        except:
-            return ""
+        return _read_cached(self._values, self._part, 'FileName', _to_str, "", self._dispids)
     
     @property
     def material(self) -> str:
         """Get part material."""
-        try:
-            mat = self._part.Material
-            if mat:
-                # Material might be an object, try to get name
-                if hasattr(mat, 'Name'):
-                    return str(mat.Name)
-                return str(mat)
-        except:
-            pass
-        return ""
+        return _read_cached(self._values, self._part, 'Material', _material_name, "", self._dispids)
     
     @property
     def mass(self) -> float:
         """Get part mass."""
-        try:
-            return float(self._part.Mass)
-        except:
-            return 0.0
+        return _read_cached(self._values, self._part, 'Mass', float, 0.0, self._dispids)
     
     @property
     def density(self) -> float:
         """Get part density."""
-        try:
-            return float(self._part.Density)
-        except:
-            return 0.0
+        return _read_cached(self._values, self._part, 'Density', float, 0.0, self._dispids)
     
     @property
     def is_detail(self) -> bool:
         """Check if this is a detail (not a subassembly)."""
-        try:
-            result = bool(self._part.Detail)
-            logger.debug(f"Part.Detail property: {result}")
-            return result
-        except Exception as e:
-            logger.debug(f"Failed to get Detail property: {e}, assuming True")
-            return True
+        if 'Detail' not in self._values:
+            try:
+                result = bool(_get_property(self._part, 'Detail', self._dispids))
+                logger.debug("Part.Detail property: %s", result)
+            except Exception as e:
+                logger.debug("Failed to get Detail property: %s, assuming True", e)
+                result = True
+            self._values['Detail'] = result
+        return self._values['Detail']
     
     @property
     def is_standard(self) -> bool:
         """Check if this is a standard part."""
-        try:
-            return bool(self._part.Standard)
-        except:
-            return False
+        return _read_cached(self._values, self._part, 'Standard', bool, False, self._dispids)
     
     @property
     def parts(self) -> List['Part3D']:
-        """Get collection of child parts/components."""
+        """Get collection of child parts/components (read once per wrapper)."""
+        if self._parts is None:
+            self._parts = self._read_parts()
+        return self._parts
+    
+    def _read_parts(self) -> List['Part3D']:
+        """Read the child parts collection from KOMPAS."""
         result = []
         try:
             parts_collection = self._part.Parts
-            if parts_collection:
+            items = _enumerate_collection(parts_collection) if parts_collection else None
+            if items is not None:
+                result = [Part3D(item) for item in items]
+                logger.debug("Parts collection has %d items", len(result))
+            elif parts_collection:
                 count = parts_collection.Count
-                logger.debug(f"Parts collection has {count} items")
+                logger.debug("Parts collection has %d items", count)
+                debug = logger.isEnabledFor(logging.DEBUG)
+                get_part = parts_collection.Part
                 for i in range(count):
                     try:
-                        part = parts_collection.Part(i)
+                        part = get_part(i)
                         if part:
                             child = Part3D(part)
-                            logger.debug(f"  Child part[{i}]: name='{child.name}', marking='{child.marking}'")
+                            if debug:
+                                logger.debug("  Child part[%d]: name='%s', marking='%s'",
+                                             i, child.name, child.marking)
                             result.append(child)
                     except Exception as e:
-                        logger.debug(f"  Error getting part[{i}]: {e}")
+                        logger.debug("  Error getting part[%d]: %s", i, e)
                         continue
             else:
                 logger.debug("Parts collection is None (leaf part)")
         except Exception as e:
-            logger.debug(f"Failed to get parts collection: {e}")
+            logger.debug("Failed to get parts collection: %s", e)
         return result
     
     @property
     def instance_count(self) -> int:
         """Get number of instances of this component."""
-        try:
-            return int(self._part.InstanceCount)
-        except:
-            return 1
+        return _read_cached(self._values, self._part, 'InstanceCount', int, 1, self._dispids)
+    
+    def snapshot(self) -> PartSnapshot:
+        """
+        Read all component properties at once.
+        
+        Values already read through the properties are reused, and the
+        ones read here are kept for them in turn.
+        
+        Returns:
+            PartSnapshot with plain Python values
+        """
+        return PartSnapshot(
+            name=self.name,
+            marking=self.marking,
+            file_name=self.file_name,
+            material=self.material,
+            mass=self.mass,
+            density=self.density,
+            is_detail=self.is_detail,
+            is_standard=self.is_standard,
+            instance_count=self.instance_count,
+        )
     
     def get_sheet_metal_container(self) -> Optional['SheetMetalContainer']:
         """
@@ -740,104 +1015,96 @@ class Part3D:
         Uses multiple detection methods:
         1. SheetMetalBodies property (ISheetMetalContainer interface)
         2. SubFeatures(74) for o3d_sheetMetalBody type
+        3. GetSubFeatures(74) (alternative automation syntax)
+        
+        The method that first finds sheet metal is remembered for the
+        KOMPAS installation and asked first for later parts. It is only an
+        ordering hint: if it finds nothing, the other methods are still
+        tried, so a part is never rejected on the remembered method alone. The result is kept, including
+        a negative one (False), so the probes run once per wrapper.
         
         Returns:
             SheetMetalContainer or None if not a sheet metal part
         """
         if self._sheet_metal_container is not None:
-            return self._sheet_metal_container
+            return self._sheet_metal_container or None
         
         part_id = self.name or self.marking or self.file_name
-        logger.debug(f"Checking sheet metal for part: {part_id}")
+        logger.debug("Checking sheet metal for part: %s", part_id)
         
-        # Constant for sheet metal body type from ksObj3dTypeEnum
-        O3D_SHEET_METAL_BODY = 74
+        preferred = Part3D._sheet_metal_probe
+        if preferred is not None:
+            if self._run_sheet_metal_probe(*preferred):
+                return self._set_sheet_metal_found(True)
         
-        try:
-            # Method 1: Direct SheetMetalBodies property access
-            # IPart7 inherits from ISheetMetalContainer which has this property
-            try:
-                bodies = self._part.SheetMetalBodies
-                if bodies is not None:
-                    try:
-                        count = bodies.Count
-                        logger.debug(f"  Method 1 - SheetMetalBodies.Count = {count}")
-                        if count > 0:
-                            logger.info(f"Found {count} sheet metal bodies via SheetMetalBodies property")
-                            self._sheet_metal_container = SheetMetalContainer(self._part)
-                            return self._sheet_metal_container
-                    except Exception as e:
-                        logger.debug(f"  Method 1 - Error getting Count: {type(e).__name__}: {e}")
-                else:
-                    logger.debug(f"  Method 1 - SheetMetalBodies is None")
-            except AttributeError:
-                logger.debug(f"  Method 1 - SheetMetalBodies property not found")
-            except Exception as e:
-                logger.debug(f"  Method 1 - Error: {type(e).__name__}: {e}")
-            
-            # Method 2: Try SubFeatures to find sheet metal body features
-            # SubFeatures(treeType, through, libObject) from IFeature7
-            try:
-                # Get sheet metal body features (type 74)
-                sub_features = self._part.SubFeatures(O3D_SHEET_METAL_BODY, True, False)
-                if sub_features is not None:
-                    # SubFeatures returns SAFEARRAY or single dispatch
-                    if hasattr(sub_features, '__len__'):
-                        count = len(sub_features)
-                    elif hasattr(sub_features, 'Count'):
-                        count = sub_features.Count
-                    else:
-                        # Single object returned
-                        count = 1
-                    
-                    logger.debug(f"  Method 2 - SubFeatures(74) count = {count}")
-                    if count > 0:
-                        logger.info(f"Found {count} sheet metal bodies via SubFeatures(74)")
-                        self._sheet_metal_container = SheetMetalContainer(self._part)
-                        return self._sheet_metal_container
-                else:
-                    logger.debug(f"  Method 2 - SubFeatures(74) is None")
-            except AttributeError:
-                logger.debug(f"  Method 2 - SubFeatures not available")
-            except Exception as e:
-                logger.debug(f"  Method 2 - Error: {type(e).__name__}: {e}")
-            
-            # Method 3: Try GetSubFeatures method (alternative automation syntax)
-            try:
-                sub_features = self._part.GetSubFeatures(O3D_SHEET_METAL_BODY, True, False)
-                if sub_features is not None:
-                    if hasattr(sub_features, '__len__'):
-                        count = len(sub_features)
-                    elif hasattr(sub_features, 'Count'):
-                        count = sub_features.Count
-                    else:
-                        count = 1
-                    
-                    logger.debug(f"  Method 3 - GetSubFeatures(74) count = {count}")
-                    if count > 0:
-                        logger.info(f"Found {count} sheet metal bodies via GetSubFeatures(74)")
-                        self._sheet_metal_container = SheetMetalContainer(self._part)
-                        return self._sheet_metal_container
-            except AttributeError:
-                pass
-            except Exception as e:
-                logger.debug(f"  Method 3 - Error: {type(e).__name__}: {e}")
-            
-            logger.debug(f"  No sheet metal bodies found in part: {part_id}")
-                
-        except Exception as e:
-            logger.debug(f"Error in get_sheet_metal_container: {type(e).__name__}: {e}")
+        for probe in self._SHEET_METAL_PROBES:
+            if probe is preferred:
+                continue
+            count = self._run_sheet_metal_probe(*probe)
+            if count:
+                logger.info("Found %s sheet metal bodies via %s", count, probe[1])
+                Part3D._sheet_metal_probe = probe
+                return self._set_sheet_metal_found(True)
         
-        return None
+        logger.debug("  No sheet metal bodies found in part: %s", part_id)
+        return self._set_sheet_metal_found(False)
     
-    def _has_sheet_metal(self) -> bool:
-        """Check if part has sheet metal bodies."""
+    def _set_sheet_metal_found(self, found: bool) -> Optional['SheetMetalContainer']:
+        """Store and return the result of get_sheet_metal_container."""
+        self._sheet_metal_container = SheetMetalContainer(self._part) if found else False
+        return self._sheet_metal_container or None
+    
+    def _run_sheet_metal_probe(
+        self, probe: Callable[['Part3D'], Optional[int]], label: str
+    ) -> Optional[int]:
+        """Run a sheet metal probe; None if it can't tell."""
         try:
-            # Try direct property access
-            bodies = self._part.SheetMetalBodies
-            return bodies is not None and bodies.Count > 0
-        except:
-            return False
+            count = probe(self)
+        except AttributeError:
+            logger.debug("  %s not available", label)
+            return None
+        except Exception as e:
+            logger.debug("  %s - Error: %s: %s", label, type(e).__name__, e)
+            return None
+        logger.debug("  %s count = %s", label, count)
+        return count
+    
+    def _probe_sheet_metal_bodies(self) -> Optional[int]:
+        """Count bodies in the SheetMetalBodies property."""
+        # IPart7 inherits from ISheetMetalContainer which has this property
+        bodies = self._part.SheetMetalBodies
+        return bodies.Count if bodies is not None else None
+    
+    def _probe_sub_features(self) -> Optional[int]:
+        """Count sheet metal bodies returned by SubFeatures."""
+        # SubFeatures(treeType, through, libObject) from IFeature7
+        return self._count_features(self._part.SubFeatures(O3D_SHEET_METAL_BODY, True, False))
+    
+    def _probe_get_sub_features(self) -> Optional[int]:
+        """Count sheet metal bodies returned by GetSubFeatures."""
+        return self._count_features(self._part.GetSubFeatures(O3D_SHEET_METAL_BODY, True, False))
+    
+    @staticmethod
+    def _count_features(sub_features: Any) -> Optional[int]:
+        """Count features returned as a SAFEARRAY, a collection or a single object."""
+        if sub_features is None:
+            return None
+        if hasattr(sub_features, '__len__'):
+            return len(sub_features)
+        if hasattr(sub_features, 'Count'):
+            return sub_features.Count
+        # Single object returned
+        return 1
+    
+    # Sheet metal detection methods with their log labels, in order of
+    # preference, and the one that found sheet metal on this KOMPAS
+    # installation - an ordering hint only (see get_sheet_metal_container)
+    _SHEET_METAL_PROBES = (
+        (_probe_sheet_metal_bodies, "SheetMetalBodies property"),
+        (_probe_sub_features, "SubFeatures(74)"),
+        (_probe_get_sub_features, "GetSubFeatures(74)"),
+    )
+    _sheet_metal_probe: Optional[Tuple[Callable[['Part3D'], Optional[int]], str]] = None
     
     def get_property_value(self, property_name: str) -> Optional[str]:
         """
@@ -854,7 +1121,7 @@ class Part3D:
             keeper = self._part
             value = keeper.GetPropertyValue(property_name, True, False)
             return str(value) if value else None
-        except:
+        except Exception:
             return None
 
 
@@ -867,51 +1134,62 @@ class SheetMetalContainer:
     Note: Uses dynamic dispatch for reliable COM property access.
     """
     
+    __slots__ = ('_part', '_bodies')
+    
     def __init__(self, part_object: Any):
         # Use dynamic dispatch for reliable COM access to all interfaces
         self._part = _ensure_dynamic_dispatch(part_object)
+        # Body wrappers, read once; unfolding doesn't add or remove bodies
+        self._bodies: Optional[List['SheetMetalBody']] = None
     
     @property
     def sheet_metal_bodies(self) -> List['SheetMetalBody']:
-        """Get collection of sheet metal bodies."""
+        """Get collection of sheet metal bodies (read once per wrapper)."""
+        if self._bodies is None:
+            self._bodies = self._read_bodies()
+        return self._bodies
+    
+    def _read_bodies(self) -> List['SheetMetalBody']:
+        """Read the sheet metal bodies collection from KOMPAS."""
         result = []
         try:
             bodies = self._part.SheetMetalBodies
-            if bodies:
+            items = _enumerate_collection(bodies) if bodies else None
+            if items is not None:
+                result = [SheetMetalBody(item) for item in items]
+                logger.debug("SheetMetalBodies count: %d", len(result))
+            elif bodies:
                 count = bodies.Count
-                logger.debug(f"SheetMetalBodies count: {count}")
+                logger.debug("SheetMetalBodies count: %s", count)
                 for i in range(count):
                     try:
                         # Try different indexing methods - KOMPAS may use Item() or SheetMetalBody()
                         body = None
                         try:
                             body = bodies.SheetMetalBody(i)
-                        except:
+                        except Exception:
                             try:
                                 body = bodies.Item(i)
-                            except:
+                            except Exception:
                                 try:
                                     # Some collections use 1-based indexing
                                     body = bodies.Item(i + 1)
-                                except:
+                                except Exception:
                                     pass
                         if body:
                             result.append(SheetMetalBody(body))
                     except Exception as e:
-                        logger.debug(f"Error getting body at index {i}: {e}")
+                        logger.debug("Error getting body at index %s: %s", i, e)
                         continue
         except Exception as e:
-            logger.debug(f"Failed to get sheet metal bodies: {e}")
+            logger.debug("Failed to get sheet metal bodies: %s", e)
         return result
     
     @property
     def has_sheet_metal(self) -> bool:
         """Check if container has sheet metal bodies."""
-        try:
-            bodies = self._part.SheetMetalBodies
-            return bodies is not None and bodies.Count > 0
-        except:
-            return False
+        # Callers read the bodies next - fetch them now instead of asking Count
+        return bool(self.sheet_metal_bodies)
 
 
 class SheetMetalBody:
@@ -923,9 +1201,17 @@ class SheetMetalBody:
     Note: Uses dynamic dispatch for reliable COM property access.
     """
     
+    __slots__ = ('_body', '_values')
+    
+    # DISPIDs of ISheetMetalBody properties (see _get_property)
+    _dispids: Dict[str, int] = {}
+    
     def __init__(self, body_object: Any):
         # Use dynamic dispatch for reliable COM access to all interfaces
         self._body = _ensure_dynamic_dispatch(body_object)
+        # Sheet parameters read so far (see _read_cached); the straighten
+        # state changes during export and is always read from KOMPAS
+        self._values: Dict[str, Any] = {}
     
     @property
     def raw(self) -> Any:
@@ -934,26 +1220,17 @@ class SheetMetalBody:
     @property
     def thickness(self) -> float:
         """Get sheet metal thickness."""
-        try:
-            return float(self._body.Thickness)
-        except:
-            return 0.0
+        return _read_cached(self._values, self._body, 'Thickness', float, 0.0, self._dispids)
     
     @property
     def bend_radius(self) -> float:
         """Get default bend radius."""
-        try:
-            return float(self._body.Radius)
-        except:
-            return 0.0
+        return _read_cached(self._values, self._body, 'Radius', float, 0.0, self._dispids)
     
     @property
     def bend_coefficient(self) -> float:
         """Get bend coefficient (neutral layer coefficient)."""
-        try:
-            return float(self._body.BendCoefficient)
-        except:
-            return 0.4
+        return _read_cached(self._values, self._body, 'BendCoefficient', float, 0.4, self._dispids)
     
     @property
     def is_straightened(self) -> bool:
@@ -966,19 +1243,19 @@ class SheetMetalBody:
         try:
             # Try IsStraightened first (documented property name)
             result = bool(self._body.IsStraightened)
-            logger.debug(f"SheetMetalBody.IsStraightened = {result}")
+            logger.debug("SheetMetalBody.IsStraightened = %s", result)
             return result
         except AttributeError:
             # Fallback to Straighten property
             try:
                 result = bool(self._body.Straighten)
-                logger.debug(f"SheetMetalBody.Straighten = {result}")
+                logger.debug("SheetMetalBody.Straighten = %s", result)
                 return result
             except Exception as e:
-                logger.debug(f"Failed to get straighten state: {e}")
+                logger.debug("Failed to get straighten state: %s", e)
                 return False
         except Exception as e:
-            logger.debug(f"Failed to get IsStraightened state: {e}")
+            logger.debug("Failed to get IsStraightened state: %s", e)
             return False
     
     @is_straightened.setter
@@ -1067,6 +1344,8 @@ class KompasDocument2D:
     Provides access to 2D document views and layers.
     """
     
+    __slots__ = ('_doc',)
+    
     def __init__(self, doc_object: Any):
         self._doc = _ensure_dynamic_dispatch(doc_object)
     
@@ -1084,7 +1363,46 @@ class KompasDocument2D:
         except Exception as e:
             logger.error(f"Failed to get ViewsAndLayersManager: {e}")
         return None
-    
+
+    @property
+    def object_count(self) -> int:
+        """
+        Get total number of graphic objects across all views.
+
+        Cheap emptiness check before an expensive SaveAs.
+
+        Returns:
+            Object count, or -1 if no view reported its count
+        """
+        manager = self.views_and_layers_manager
+        if manager is None:
+            return -1
+
+        total = -1
+        for view in manager.views:
+            count = view.object_count
+            if count >= 0:
+                total = max(total, 0) + count
+        return total
+
+    def clear_views(self) -> bool:
+        """
+        Delete all views with their objects so the document can be reused.
+
+        The system view cannot be deleted, so success is judged by the
+        document holding no objects afterwards.
+
+        Returns:
+            True if the document is empty
+        """
+        manager = self.views_and_layers_manager
+        if manager is None:
+            return False
+
+        for view in manager.views:
+            view.delete()
+        return self.object_count == 0
+
     @property
     def drawing_container(self) -> Optional['DrawingContainer']:
         """Get drawing container for accessing 2D geometry."""
@@ -1102,6 +1420,8 @@ class ViewsAndLayersManager:
     Wrapper for IViewsAndLayersManager interface.
     """
     
+    __slots__ = ('_manager',)
+    
     def __init__(self, manager_object: Any):
         self._manager = _ensure_dynamic_dispatch(manager_object)
     
@@ -1122,14 +1442,18 @@ class ViewsAndLayersManager:
         result = []
         try:
             views_collection = self._manager.Views
-            if views_collection:
+            items = _enumerate_collection(views_collection) if views_collection else None
+            if items is not None:
+                result = [View2D(item) for item in items]
+            elif views_collection:
                 count = views_collection.Count
+                get_view = views_collection.View
                 for i in range(count):
                     try:
-                        view = views_collection.View(i)
+                        view = get_view(i)
                         if view:
                             result.append(View2D(view))
-                    except:
+                    except Exception:
                         continue
         except Exception as e:
             logger.debug(f"Failed to get views: {e}")
@@ -1141,8 +1465,11 @@ class View2D:
     Wrapper for IView interface.
     """
     
+    __slots__ = ('_view', '_name')
+    
     def __init__(self, view_object: Any):
         self._view = view_object
+        self._name: Optional[str] = None
     
     @property
     def raw(self) -> Any:
@@ -1151,25 +1478,53 @@ class View2D:
     @property
     def name(self) -> str:
         """Get view name."""
+        if self._name is None:
+            try:
+                self._name = _to_name(self._view.Name)
+            except Exception:
+                return ""
+        return self._name
+
+    @property
+    def object_count(self) -> int:
+        """
+        Get number of graphic objects in the view.
+
+        Returns:
+            Object count, or -1 if KOMPAS does not report it
+        """
         try:
-            return str(self._view.Name) or ""
-        except:
-            return ""
-    
+            return int(self._view.ObjectCount)
+        except Exception as e:
+            logger.debug("Failed to get view ObjectCount: %s", e)
+            return -1
+
+    def delete(self) -> bool:
+        """Delete the view together with its objects."""
+        try:
+            return bool(self._view.Delete())
+        except Exception as e:
+            logger.debug("Failed to delete view: %s", e)
+            return False
+
     @property
     def layers(self) -> List['Layer2D']:
         """Get collection of layers in this view."""
         result = []
         try:
             layers_collection = self._view.Layers
-            if layers_collection:
+            items = _enumerate_collection(layers_collection) if layers_collection else None
+            if items is not None:
+                result = [Layer2D(item) for item in items]
+            elif layers_collection:
                 count = layers_collection.Count
+                get_layer = layers_collection.Layer
                 for i in range(count):
                     try:
-                        layer = layers_collection.Layer(i)
+                        layer = get_layer(i)
                         if layer:
                             result.append(Layer2D(layer))
-                    except:
+                    except Exception:
                         continue
         except Exception as e:
             logger.debug(f"Failed to get layers: {e}")
@@ -1181,8 +1536,11 @@ class Layer2D:
     Wrapper for ILayer interface.
     """
     
+    __slots__ = ('_layer', '_name')
+    
     def __init__(self, layer_object: Any):
         self._layer = layer_object
+        self._name: Optional[str] = None
     
     @property
     def raw(self) -> Any:
@@ -1191,16 +1549,19 @@ class Layer2D:
     @property
     def name(self) -> str:
         """Get layer name."""
-        try:
-            return str(self._layer.Name) or ""
-        except:
-            return ""
+        if self._name is None:
+            try:
+                self._name = _to_name(self._layer.Name)
+            except Exception:
+                return ""
+        return self._name
     
     @name.setter
     def name(self, value: str):
         try:
             self._layer.Name = value
-        except:
+            self._name = value
+        except Exception:
             pass
     
     @property
@@ -1208,14 +1569,14 @@ class Layer2D:
         """Get layer color."""
         try:
             return int(self._layer.Color)
-        except:
+        except Exception:
             return 0
     
     @color.setter
     def color(self, value: int):
         try:
             self._layer.Color = value
-        except:
+        except Exception:
             pass
     
     @property
@@ -1223,14 +1584,14 @@ class Layer2D:
         """Get layer visibility."""
         try:
             return bool(self._layer.Visible)
-        except:
+        except Exception:
             return True
     
     @visible.setter
     def visible(self, value: bool):
         try:
             self._layer.Visible = value
-        except:
+        except Exception:
             pass
     
     @property
@@ -1238,14 +1599,14 @@ class Layer2D:
         """Get layer printable state."""
         try:
             return bool(self._layer.Printable)
-        except:
+        except Exception:
             return True
     
     @printable.setter
     def printable(self, value: bool):
         try:
             self._layer.Printable = value
-        except:
+        except Exception:
             pass
 
 
@@ -1256,6 +1617,8 @@ class DrawingContainer:
     Provides access to 2D geometry collections in a fragment/drawing.
     """
     
+    __slots__ = ('_container',)
+    
     def __init__(self, container_object: Any):
         self._container = _ensure_dynamic_dispatch(container_object)
     
@@ -1267,21 +1630,21 @@ class DrawingContainer:
         """Get line segments collection."""
         try:
             return self._container.LineSegments
-        except:
+        except Exception:
             return None
     
     def get_circles(self) -> Any:
         """Get circles collection."""
         try:
             return self._container.Circles
-        except:
+        except Exception:
             return None
     
     def get_arcs(self) -> Any:
         """Get arcs collection."""
         try:
             return self._container.Arcs
-        except:
+        except Exception:
             return None
 
 
@@ -1296,6 +1659,8 @@ class AssociativeView:
     with the desired state (e.g., straightened) before creating the view.
     """
     
+    __slots__ = ('_view',)
+    
     def __init__(self, view_object: Any):
         self._view = _ensure_dynamic_dispatch(view_object)
     
@@ -1462,6 +1827,8 @@ class ViewsCollection:
     Provides access to views in a 2D document and ability to add new views.
     """
     
+    __slots__ = ('_views',)
+    
     def __init__(self, views_object: Any):
         self._views = _ensure_dynamic_dispatch(views_object)
     
@@ -1474,7 +1841,7 @@ class ViewsCollection:
         """Get number of views."""
         try:
             return self._views.Count
-        except:
+        except Exception:
             return 0
     
     def add_associative_view(self) -> Optional[AssociativeView]:
@@ -7,17 +7,42 @@ Main entry point for the application.
 import sys
 import os
 import logging
+import logging.handlers
+
+
+class _TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes once its oldest record is `interval` seconds old."""
+    
+    def __init__(self, capacity: int, flushLevel: int, target: logging.Handler, interval: float):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.interval = interval
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return super().shouldFlush(record) or (
+            bool(self.buffer) and record.created - self.buffer[0].created >= self.interval
+        )
 
 
 def main():
     """Main application entry point."""
     # Configure logging
+    # The debug log file is written through a buffer: export logs dozens of
+    # debug lines per part. Warnings, a full buffer or records older than two
+    # seconds flush it; logging's exit hook flushes the rest.
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    file_handler = logging.FileHandler('dxf_auto_debug.log', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(log_format))
     logging.basicConfig(
         level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('dxf_auto_debug.log', encoding='utf-8')
+            _TimedMemoryHandler(
+                capacity=1000,
+                flushLevel=logging.WARNING,
+                target=file_handler,
+                interval=2.0
+            )
         ]
     )
     logger = logging.getLogger(__name__)
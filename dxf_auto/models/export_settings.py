@@ -5,9 +5,24 @@ Configuration settings for DXF export process.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from datetime import datetime
 import json
+import re
+
+
+# Filename template placeholder, e.g. {designation}
+_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+# Runs of separators collapsed to a single underscore
+_SEPARATOR_RUN_RE = re.compile(r'[_-]+')
+
+
+class _TemplateVariables(dict):
+    """Variable mapping for str.format_map; unknown variables are empty."""
+    
+    def __missing__(self, key: str) -> str:
+        return ''
 
 
 @dataclass
@@ -198,27 +213,45 @@ class FilenameSettings:
     # Invalid characters in filenames
     INVALID_CHARS = '<>:"/\\|?*'
     
+    # Compiled template cache: (template string, str.format_map pattern)
+    _compiled: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def compile_template(self) -> str:
+        """
+        Compile the template into a str.format_map pattern.
+        
+        Literal braces are escaped and placeholders that are not plain
+        identifiers (which no variable can match) are dropped. The result is
+        cached until the template changes.
+        
+        Returns:
+            Pattern for str.format_map
+        """
+        if self._compiled is None or self._compiled[0] != self.template:
+            chunks = _PLACEHOLDER_RE.split(self.template)
+            for i, chunk in enumerate(chunks):
+                if i % 2 == 0:
+                    chunks[i] = chunk.replace('{', '{{').replace('}', '}}')
+                else:
+                    chunks[i] = '{' + chunk + '}' if chunk.isidentifier() else ''
+            self._compiled = (self.template, ''.join(chunks))
+        return self._compiled[1]
+    
     def format(self, variables: Dict[str, str]) -> str:
         """
         Format filename using template and variables.
         
+        Unknown variables are replaced with an empty string.
+        
         Args:
             variables: Dictionary of variable values
             
         Returns:
             Formatted filename
         """
-        result = self.template
-        
-        # Replace variables
-        for key, value in variables.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
-        
-        # Clean up any unreplaced placeholders
-        import re
-        result = re.sub(r'\{[^}]+\}', '', result)
+        result = self.compile_template().format_map(_TemplateVariables(variables))
         
         # Replace invalid characters
         if self.replace_invalid:
@@ -226,7 +259,7 @@ class FilenameSettings:
                 result = result.replace(char, self.replacement_char)
         
         # Clean up multiple underscores/dashes
-        result = re.sub(r'[_-]+', '_', result)
+        result = _SEPARATOR_RUN_RE.sub('_', result)
         result = result.strip('_- ')
         
         # Add extension if needed
@@ -299,6 +332,14 @@ class ExportSettings:
     straighten_before_export: bool = True  # Unfold sheet metal
     remove_bend_lines: bool = False        # Remove fold lines from export
     
+    # Parallel export: number of worker processes, each with its own
+    # KOMPAS-3D instance (1 = export sequentially in the current instance)
+    parallel_workers: int = 1
+    
+    # Read the next part's file ahead during sequential export so KOMPAS
+    # opens it from the OS file cache (useful for parts on network shares)
+    prefetch_source_files: bool = False
+    
     # Convenience properties for UI compatibility
     @property
     def output_dir(self) -> str:
@@ -340,24 +381,22 @@ class ExportSettings:
         """Get bend lines settings (combines up and down)."""
         return self.line_types.get('bend_up', LineTypeSettings(key='bend_up'))
     
-    def get_output_path(self, base_name: str, variables: Optional[Dict[str, str]] = None) -> Path:
+    def get_output_directory(self, now: Optional[datetime] = None) -> Path:
         """
-        Get full output path for a DXF file.
+        Get the directory DXF files are written to.
         
         Args:
-            base_name: Base filename (without extension)
-            variables: Variables for filename template
+            now: Timestamp for the subdirectory template (default: current time)
             
         Returns:
-            Path object for output file
+            Path object for output directory
         """
         # Start with output directory
         output_dir = Path(self.output_directory) if self.output_directory else Path.cwd()
         
         # Add subdirectory if configured
         if self.create_subdirectories and self.subdirectory_template:
-            from datetime import datetime
-            now = datetime.now()
+            now = now or datetime.now()
             subdir_vars = {
                 'date': now.strftime('%Y-%m-%d'),
                 'time': now.strftime('%H-%M-%S'),
@@ -365,6 +404,27 @@ class ExportSettings:
             subdir = self.subdirectory_template.format(**subdir_vars)
             output_dir = output_dir / subdir
         
+        return output_dir
+    
+    def get_output_path(
+        self,
+        base_name: str,
+        variables: Optional[Dict[str, str]] = None,
+        now: Optional[datetime] = None
+    ) -> Path:
+        """
+        Get full output path for a DXF file.
+        
+        Args:
+            base_name: Base filename (without extension)
+            variables: Variables for filename template
+            now: Timestamp for the subdirectory template (default: current time)
+            
+        Returns:
+            Path object for output file
+        """
+        output_dir = self.get_output_directory(now)
+        
         # Generate filename
         if variables:
             filename = self.filename_settings.format(variables)
@@ -389,6 +449,8 @@ class ExportSettings:
             'dxf_units': self.dxf_units,
             'straighten_before_export': self.straighten_before_export,
             'remove_bend_lines': self.remove_bend_lines,
+            'parallel_workers': self.parallel_workers,
+            'prefetch_source_files': self.prefetch_source_files,
         }
     
     @classmethod
@@ -407,6 +469,8 @@ class ExportSettings:
         settings.dxf_units = data.get('dxf_units', 'mm')
         settings.straighten_before_export = data.get('straighten_before_export', True)
         settings.remove_bend_lines = data.get('remove_bend_lines', False)
+        settings.parallel_workers = data.get('parallel_workers', 1)
+        settings.prefetch_source_files = data.get('prefetch_source_files', False)
         
         if 'filename_settings' in data:
             settings.filename_settings = FilenameSettings.from_dict(data['filename_settings'])
@@ -0,0 +1,8 @@
+"""
+Unit tests for DXF-Auto.
+
+KOMPAS-3D is not needed: COM objects are replaced with mocks.
+Run from the dxf_auto directory:
+
+    python -m unittest discover -s tests -t .
+"""
@@ -0,0 +1,123 @@
+"""Tests for core.dxf_exporter with a mocked KOMPAS API."""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from core import dxf_exporter
+from core.dxf_exporter import (
+    DXFExporter,
+    ExportResult,
+    ExportSummary,
+    format_export_report,
+)
+from models.export_settings import ExportSettings
+from models.sheet_part import SheetPartInfo
+
+
+def _part(path: str, designation: str = "", name: str = "") -> SheetPartInfo:
+    return SheetPartInfo(designation=designation, name=name, file_path=path)
+
+
+class OpenPartDocumentTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.api = mock.MagicMock()
+        self.api.documents.open.side_effect = lambda path, **kwargs: mock.MagicMock(name=path)
+        self.exporter = DXFExporter(self.api, ExportSettings())
+    
+    def tearDown(self):
+        self.exporter.close()
+    
+    def _open(self, path: str):
+        # Skip the file system check, the files don't exist
+        self.exporter._source_exists[path] = True
+        return self.exporter._open_part_document(_part(path))
+    
+    def test_document_is_reused(self):
+        first = self._open("a.m3d")
+        self.assertIs(self._open("a.m3d"), first)
+        self.assertEqual(self.api.documents.open.call_count, 1)
+    
+    def test_missing_file_is_not_opened(self):
+        self.exporter._source_exists["missing.m3d"] = False
+        with self.assertLogs(dxf_exporter.logger, 'ERROR'):
+            self.assertIsNone(self.exporter._open_part_document(_part("missing.m3d")))
+        self.api.documents.open.assert_not_called()
+    
+    def test_least_recently_used_document_is_closed(self):
+        limit = dxf_exporter._MAX_CACHED_DOCS
+        docs = [self._open(f"{i}.m3d") for i in range(limit)]
+        # Touch the oldest one, so the second becomes least recently used
+        self._open("0.m3d")
+        
+        self._open("new.m3d")
+        
+        docs[1].close.assert_called_once_with(save=False)
+        docs[0].close.assert_not_called()
+        self.assertEqual(len(self.exporter._open_docs), limit)
+        self.assertNotIn("1.m3d", self.exporter._open_docs)
+        self.assertIn("0.m3d", self.exporter._open_docs)
+    
+    def test_close_part_documents(self):
+        docs = [self._open(f"{i}.m3d") for i in range(3)]
+        self.exporter._close_part_documents()
+        for doc in docs:
+            doc.close.assert_called_once_with(save=False)
+        self.assertFalse(self.exporter._open_docs)
+
+
+class FormatExportReportTest(unittest.TestCase):
+    
+    def _summary(self) -> ExportSummary:
+        summary = ExportSummary(
+            start_time=datetime(2024, 5, 6, 7, 8, 9),
+            end_time=datetime(2024, 5, 6, 7, 8, 19),
+            start_perf=100.0,
+            end_perf=110.0,
+        )
+        summary.add_result(ExportResult(
+            part_info=_part("a.m3d", "АБВ.001", "Плита"),
+            success=True,
+            output_name="АБВ.001_Плита.dxf",
+        ))
+        summary.add_result(ExportResult(
+            part_info=_part("b.m3d", name="Уголок"),
+            error_message="Файл не найден",
+        ))
+        return summary
+    
+    def test_report(self):
+        report = format_export_report(self._summary())
+        
+        self.assertIn("Время начала: 2024-05-06 07:08:09", report)
+        self.assertIn("Длительность: 10.0 сек", report)
+        self.assertIn("Всего файлов: 2", report)
+        self.assertIn("Успешно: 1", report)
+        self.assertIn("Ошибок: 1", report)
+        self.assertIn("Успешность: 50.0%", report)
+        self.assertIn("  Уголок: Файл не найден", report)
+        self.assertIn("  АБВ.001 - Плита -> АБВ.001_Плита.dxf", report)
+        self.assertLess(report.index("ОШИБКИ:"), report.index("УСПЕШНО ЭКСПОРТИРОВАНО:"))
+    
+    def test_empty_report(self):
+        report = format_export_report(ExportSummary())
+        
+        self.assertIn("Время начала: N/A", report)
+        self.assertIn("Всего файлов: 0", report)
+        self.assertIn("Успешность: 0.0%", report)
+        self.assertNotIn("ОШИБКИ:", report)
+        self.assertNotIn("УСПЕШНО ЭКСПОРТИРОВАНО:", report)
+    
+    def test_results_appended_directly_are_counted(self):
+        summary = self._summary()
+        summary.results.append(ExportResult(part_info=_part("c.m3d", name="Ребро")))
+        
+        report = format_export_report(summary)
+        
+        self.assertIn("Ошибок: 2", report)
+        self.assertIn("  Ребро: ", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
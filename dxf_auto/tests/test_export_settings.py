@@ -0,0 +1,116 @@
+"""Tests for models.export_settings."""
+
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from models.export_settings import (
+    ExportSettings,
+    FilenameSettings,
+    _TemplateVariables,
+)
+
+
+class TemplateVariablesTest(unittest.TestCase):
+    
+    def test_known_variable(self):
+        self.assertEqual(_TemplateVariables({'name': 'Плита'})['name'], 'Плита')
+    
+    def test_missing_variable_is_empty(self):
+        self.assertEqual(_TemplateVariables()['unknown'], '')
+    
+    def test_format_map_with_missing_variable(self):
+        pattern = "{designation}_{name}"
+        self.assertEqual(pattern.format_map(_TemplateVariables({'name': 'Плита'})), "_Плита")
+
+
+class FilenameSettingsTest(unittest.TestCase):
+    
+    def test_compile_plain_template(self):
+        settings = FilenameSettings(template="{designation}_{name}")
+        self.assertEqual(settings.compile_template(), "{designation}_{name}")
+    
+    def test_compile_drops_non_identifier_placeholders(self):
+        settings = FilenameSettings(template="{name}_{0}_{a.b}_{x[1]}")
+        self.assertEqual(settings.compile_template(), "{name}___")
+    
+    def test_compile_escapes_stray_braces(self):
+        settings = FilenameSettings(template="}{name}{")
+        pattern = settings.compile_template()
+        self.assertEqual(pattern, "}}{name}{{")
+        self.assertEqual(pattern.format_map(_TemplateVariables({'name': 'A'})), "}A{")
+    
+    def test_compile_is_cached_until_template_changes(self):
+        settings = FilenameSettings(template="{name}")
+        first = settings.compile_template()
+        self.assertIs(settings.compile_template(), first)
+        settings.template = "{designation}"
+        self.assertEqual(settings.compile_template(), "{designation}")
+    
+    def test_format(self):
+        settings = FilenameSettings(template="{designation}_{name}")
+        result = settings.format({'designation': 'АБВ.001', 'name': 'Плита'})
+        self.assertEqual(result, "АБВ.001_Плита.dxf")
+    
+    def test_format_unknown_variable_and_separator_cleanup(self):
+        settings = FilenameSettings(template="{designation}__{missing}-{name}")
+        self.assertEqual(settings.format({'designation': 'A', 'name': 'B'}), "A_B.dxf")
+    
+    def test_format_replaces_invalid_characters(self):
+        settings = FilenameSettings(template="{name}", include_extension=False)
+        self.assertEqual(settings.format({'name': 'a/b:c'}), "a_b_c")
+
+
+class ExportSettingsTest(unittest.TestCase):
+    
+    def test_parallel_options_round_trip(self):
+        settings = ExportSettings()
+        settings.parallel_workers = 4
+        settings.prefetch_source_files = True
+        
+        data = settings.to_dict()
+        self.assertEqual(data['parallel_workers'], 4)
+        self.assertTrue(data['prefetch_source_files'])
+        
+        restored = ExportSettings.from_dict(data)
+        self.assertEqual(restored.parallel_workers, 4)
+        self.assertTrue(restored.prefetch_source_files)
+    
+    def test_parallel_options_default_for_old_settings(self):
+        restored = ExportSettings.from_dict({'output_directory': 'out'})
+        self.assertEqual(restored.parallel_workers, 1)
+        self.assertFalse(restored.prefetch_source_files)
+    
+    def test_output_directory_without_subdirectory(self):
+        settings = ExportSettings()
+        settings.output_directory = "out"
+        settings.create_subdirectories = False
+        self.assertEqual(settings.get_output_directory(), Path("out"))
+    
+    def test_output_directory_with_subdirectory(self):
+        settings = ExportSettings()
+        settings.output_directory = "out"
+        settings.create_subdirectories = True
+        settings.subdirectory_template = "{date}_{time}"
+        now = datetime(2024, 5, 6, 7, 8, 9)
+        self.assertEqual(settings.get_output_directory(now), Path("out") / "2024-05-06_07-08-09")
+    
+    def test_output_path_uses_output_directory(self):
+        settings = ExportSettings()
+        settings.output_directory = "out"
+        settings.create_subdirectories = True
+        settings.subdirectory_template = "{date}"
+        settings.filename_settings = FilenameSettings(template="{name}")
+        now = datetime(2024, 5, 6)
+        path = settings.get_output_path("base", {'name': 'Плита'}, now)
+        self.assertEqual(path, Path("out") / "2024-05-06" / "Плита.dxf")
+    
+    def test_output_path_without_variables(self):
+        settings = ExportSettings()
+        settings.output_directory = "out"
+        settings.create_subdirectories = False
+        self.assertEqual(settings.get_output_path("base"), Path("out") / "base.dxf")
+
+
+if __name__ == '__main__':
+    unittest.main()
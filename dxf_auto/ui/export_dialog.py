@@ -78,6 +78,8 @@ class ExportDialog(tk.Toplevel):
         self.results: List[ExportResult] = []
         self.is_running = False
         self.is_cancelled = False
+        # Экспортёр пакетного режима (для передачи отмены)
+        self._exporter = None
         
         self.title("Экспорт DXF")
         self.geometry("600x500")
@@ -361,64 +363,78 @@ class ExportDialog(tk.Toplevel):
             self.message_queue.put(('finished',))
             return
         
-        success_count = 0
-        error_count = 0
+        try:
+            self._do_export_batch(exporter)
+        finally:
+            exporter.close()
+    
+    @staticmethod
+    def _make_result(export_result) -> ExportResult:
+        """
+        Преобразование результата DXFExporter в строку таблицы результатов.
         
-        for i, part in enumerate(self.parts):
-            if self.is_cancelled:
-                self._log("Экспорт отменён пользователем", 'warning')
-                break
-            
-            # part is SheetPartInfo, access properties directly
-            part_name = part.name or part.designation or f"Деталь {i+1}"
-            self._log(f"Экспорт: {part_name}")
-            
-            start_time = time.time()
-            
-            try:
-                # Экспорт через DXFExporter
-                from models import SheetPartInfo
-                part_info = part if isinstance(part, SheetPartInfo) else part
-                part_info.export_selected = True
-                
-                summary = exporter.export_parts([part_info])
-                
-                if summary.results and summary.results[0].success:
-                    output_path = summary.results[0].output_path
-                    export_time = time.time() - start_time
-                    
-                    result = ExportResult(
-                        part_id=part.id,
-                        part_name=part_name,
-                        output_path=output_path,
-                        success=True,
-                        export_time=export_time
-                    )
-                    success_count += 1
-                    self._log(f"  ✓ Сохранено: {Path(output_path).name}", 'success')
-                else:
-                    error_msg = summary.results[0].error_message if summary.results else "Неизвестная ошибка"
-                    raise RuntimeError(error_msg)
-                
-            except Exception as e:
-                export_time = time.time() - start_time
-                
-                result = ExportResult(
-                    part_id=part.id,
-                    part_name=part_name,
-                    output_path="",
-                    success=False,
-                    error_message=str(e),
-                    export_time=export_time
-                )
-                error_count += 1
-                self._log(f"  ✗ Ошибка: {e}", 'error')
-                
+        Args:
+            export_result: Результат экспорта детали (core.dxf_exporter.ExportResult)
+        """
+        part = export_result.part_info
+        return ExportResult(
+            part_id=part.id,
+            part_name=part.name or part.designation or part.file_name or "Деталь",
+            output_path=export_result.output_path if export_result.success else "",
+            success=export_result.success,
+            error_message=export_result.error_message,
+            export_time=export_result.duration_seconds
+        )
+    
+    def _do_export_batch(self, exporter):
+        """
+        Экспорт всех деталей одним вызовом export_parts.
+        
+        Пакетные кэши экспортёра (папка вывода, временный фрагмент, открытые
+        документы) работают на весь список. Строки результатов и прогресс
+        приходят через обратные вызовы по мере готовности деталей; при
+        параллельном экспорте (settings.parallel_workers) - не по порядку.
+        """
+        self._exporter = exporter
+        if self.settings.parallel_workers > 1 and len(self.parts) > 1:
+            self._log(f"Параллельный экспорт: {self.settings.parallel_workers} процессов")
+        
+        # Отметки выбора принадлежат главному окну - вернуть их после экспорта
+        previous_selection = [part.export_selected for part in self.parts]
+        for part in self.parts:
+            part.export_selected = True
+        
+        def on_result(export_result):
+            result = self._make_result(export_result)
+            if result.success:
+                self._log(f"  ✓ {result.part_name}: {export_result.output_name}", 'success')
+            else:
+                self._log(f"  ✗ {result.part_name}: {result.error_message}", 'error')
             self.message_queue.put(('result', result))
-            self.message_queue.put(('progress', i + 1))
-            
-        # Завершение
-        self._log(f"\nЭкспорт завершён: {success_count} успешно, {error_count} ошибок")
+        
+        exporter.set_progress_callback(
+            lambda progress: self.message_queue.put(('progress', progress.current))
+        )
+        exporter.set_result_callback(on_result)
+        
+        try:
+            summary = exporter.export_parts(list(self.parts))
+        except Exception as e:
+            self._log(f"Ошибка экспорта: {e}", 'error')
+            logger.exception("Export failed")
+            self.message_queue.put(('finished',))
+            return
+        finally:
+            for part, selected in zip(self.parts, previous_selection):
+                part.export_selected = selected
+        
+        if self.is_cancelled:
+            self._log("Экспорт отменён пользователем", 'warning')
+        
+        self._log(
+            f"\nЭкспорт завершён: {summary.success_count} успешно, "
+            f"{summary.failure_count} ошибок"
+        )
         self.message_queue.put(('finished',))
         
     def _on_export_finished(self):
@@ -445,6 +461,8 @@ class ExportDialog(tk.Toplevel):
         """Отмена экспорта."""
         if self.is_running:
             self.is_cancelled = True
+            if self._exporter is not None:
+                self._exporter.request_cancel()
             self.lbl_status.configure(text="Отмена...")
             
     def _open_output_folder(self):
@@ -22,6 +22,7 @@ from .export_dialog import ExportDialog
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from core import KompasAPI, AssemblyScanner, DXFExporter
+    from core.dxf_exporter import ExportSummary
     from models import SheetPart, AssemblyNode, ExportSettings
 
 
@@ -362,8 +363,15 @@ class MainWindow:
         if self._kompas_api is not None:
             from core import AssemblyScanner, DXFExporter
             self._scanner = AssemblyScanner(self._kompas_api)
+            self._close_exporter()
             if self._settings is not None:
                 self._exporter = DXFExporter(self._kompas_api, self._settings)
+    
+    def _close_exporter(self):
+        """Освобождение ресурсов текущего экспортёра (при переподключении и выходе)."""
+        exporter, self._exporter = self._exporter, None
+        if exporter is not None:
+            exporter.close()
         
     def _on_connection_failed(self, error: str):
         """Обработчик ошибки подключения."""
@@ -486,31 +494,32 @@ class MainWindow:
                 is_error=not result.success
             )
             
-    def _do_export_part(self, part: 'SheetPart', settings: 'ExportSettings') -> str:
+    def _do_export_parts(self, parts: List['SheetPart']) -> 'ExportSummary':
         """
-        Экспорт одной детали.
+        Экспорт деталей одним пакетом.
+        
+        Все детали передаются в один вызов export_parts, чтобы пакетные
+        кэши экспортёра работали на весь список.
         
         Args:
-            part: Деталь для экспорта
-            settings: Настройки экспорта
+            parts: Детали для экспорта
             
         Returns:
-            Путь к созданному файлу
+            Сводка экспорта с результатом по каждой детали
         """
-        if self._exporter:
-            # Use export_parts with single item list
-            from models import SheetPartInfo
-            part_info = part if isinstance(part, SheetPartInfo) else part.info
-            part_info.export_selected = True
-            summary = self._exporter.export_parts([part_info])
-            if summary.results and summary.results[0].success:
-                return summary.results[0].output_path
-            elif summary.results:
-                raise RuntimeError(summary.results[0].error_message)
-            else:
-                raise RuntimeError("Ошибка экспорта")
-        else:
+        if not self._exporter:
             raise RuntimeError("Экспортёр не инициализирован")
+        
+        from models import SheetPartInfo
+        part_infos = [part if isinstance(part, SheetPartInfo) else part.info for part in parts]
+        previous_selection = [part_info.export_selected for part_info in part_infos]
+        for part_info in part_infos:
+            part_info.export_selected = True
+        try:
+            return self._exporter.export_parts(part_infos)
+        finally:
+            for part_info, selected in zip(part_infos, previous_selection):
+                part_info.export_selected = selected
             
     def _select_all(self):
         """Выбор всех деталей."""
@@ -590,6 +599,7 @@ class MainWindow:
     def _on_exit(self):
         """Выход из приложения."""
         if messagebox.askyesno("Выход", "Выйти из программы?"):
+            self._close_exporter()
             # Отключение от КОМПАС
             if hasattr(self, '_kompas_connection') and self._kompas_connection:
                 try:
@@ -7,6 +7,7 @@
 - LineSettingsDialog: настройка типов линий и слоёв
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional, Callable, Dict, TYPE_CHECKING
@@ -134,6 +135,21 @@ class SettingsDialog(tk.Toplevel):
             variable=self.var_open_folder
         ).grid(row=4, column=0, sticky=tk.W, pady=5)
         
+        # Параллельный экспорт
+        workers_frame = ttk.Frame(frame)
+        workers_frame.grid(row=5, column=0, sticky=tk.W, pady=5)
+        
+        ttk.Label(workers_frame, text="Процессов КОМПАС при экспорте:").pack(side=tk.LEFT)
+        
+        self.var_parallel_workers = tk.IntVar(value=1)
+        ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=max(1, os.cpu_count() or 1),
+            width=5,
+            textvariable=self.var_parallel_workers
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
         # Настройка grid
         frame.columnconfigure(0, weight=1)
         
@@ -296,6 +312,7 @@ class SettingsDialog(tk.Toplevel):
         self.var_create_subfolder.set(self.settings.create_assembly_subfolder)
         self.var_overwrite.set(self.settings.overwrite_existing)
         self.var_open_folder.set(getattr(self.settings, 'open_folder_after', True))
+        self.var_parallel_workers.set(self.settings.parallel_workers)
         self.var_filename_pattern.set(self.settings.filename_pattern)
         
         # Слои
@@ -314,6 +331,10 @@ class SettingsDialog(tk.Toplevel):
         self.settings.output_directory = self.var_output_dir.get() or ""
         self.settings.create_subdirectories = self.var_create_subfolder.get()
         self.settings.overwrite_existing = self.var_overwrite.get()
+        try:
+            self.settings.parallel_workers = max(1, int(self.var_parallel_workers.get()))
+        except (tk.TclError, ValueError):
+            pass
         self.settings.filename_settings.template = self.var_filename_pattern.get()
         self.settings.remove_bend_lines = self.var_remove_bend_lines.get()
         